@@ -1,36 +1,166 @@
 import collections
+import concurrent.futures
 import heapq
+import itertools
 import logging
-from states import State, SearchResult
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import time
+from constructive import BLOCK_SIZE, solve_constructive
+from external_bfs import (
+    CHUNK_SIZE,
+    LayerFiles,
+    expand_layer,
+    get_layer_path,
+    iter_layer,
+    load_layer,
+    merge_runs,
+    write_initial_layer,
+)
+from frontier import (
+    check_layout,
+    contains_sorted,
+    decode_board,
+    encode_boards,
+    expand_frontier,
+    find_blanks,
+    manhattan_distances,
+)
+from monitor import NULL_MONITOR, observed
+from open_list import new_open_list
+from pattern_database import get_pattern_databases
+from path_optimizer import optimize_solution
+from states import NodeTable, State, SearchResult, SearchSummary
+from visited import new_visited
+from solution_table import MAX_TABLE_CELLS, get_solution_table, lookup_solution
 from euristicas import *
 
 log = logging.getLogger(__name__)
 
+# parallel A*: states expanded between sending batches, seconds an idle worker
+# waits for states, and seconds between status reports of a busy worker
+HDA_BATCH = 256
+HDA_IDLE_WAIT = 0.01
+HDA_REPORT_INTERVAL = 0.05
+# parallel IDA*: the subtrees per worker, the expansions between checks for
+# cancellation, and seconds between budget checks
+IDA_SPLIT_FACTOR = 8
+IDA_CANCEL_INTERVAL = 1024
+IDA_POLL_INTERVAL = 0.1
+# returned instead of the next bound by an IDA* iteration that found the goal or
+# was stopped (by a budget or by cancellation)
+IDA_FOUND, IDA_CANCELLED = -1, -2
+# a 64-bit multiplicative hash (Fibonacci hashing) of packed boards
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_MASK = (1 << 64) - 1
+
 
 class Algorithm(enum.Enum):
     A_ESTRELA = "a*"
+    A_ESTRELA_PARALELO = "parallel-a*"
     BUSCA_LARGURA = "bfs"
+    BUSCA_LARGURA_VETORIZADA = "vectorized-bfs"
+    BUSCA_LARGURA_EXTERNA = "external-bfs"
     BUSCA_PROFUNDIDADE = "dfs"
     BUSCA_GULOSA = "greedy"
     DIJKSTRA = "dijkstra"
+    IDA_STAR = "ida*"
+    IDA_STAR_PARALELO = "parallel-ida*"
+    BUSCA_BIDIRECIONAL = "bidirectional-bfs"
+    A_ESTRELA_BIDIRECIONAL = "bidirectional-a*"
+    TABLE_LOOKUP = "table"
+    CONSTRUTIVO = "constructive"
 
 
-def get_next_states(state: State) -> list[State]:
-    moves = get_valid_moves(state.board, state.blank_pos)
+def get_initial_state(board: Board) -> State:
+    r"""
+    Packs the board into the root :class:`State` of a search.
+    """
+    _, w = board.shape
+    y, x = find_blank(board)
+    return State(pack_board(board), int(y) * w + int(x))
+
+
+def get_next_states(
+        state: State,
+        layout: Layout,
+        nodes: NodeTable,
+        heuristic: Optional[Heuristic] = None,
+        delta: Optional[HeuristicDelta] = None,
+) -> list[State]:
+    r"""
+    Expands a state. When a heuristic is given, each child's ``h`` is set from
+    the parent's value and ``delta`` if possible, otherwise by full evaluation.
+    """
     next_states = []
-    for move in moves:
-        # construct altered board
-        next_board = np.copy(state.board)
-        swap_tiles(next_board, state.blank_pos, move)
-        # update history
-        next_history = state.history.copy()
-        next_history.append(move)
+    for move, shift, factor in layout.moves[state.blank_pos]:
+        # construct altered board by shifting the tile into the blank
+        tile = (state.board >> shift) & layout.mask
+        next_board = state.board + tile * factor
+        # record a back-pointer instead of copying the history
+        node = nodes.add(state.node, move)
         # after moving, the move is now the blank_pos
-        next_state = State(next_board, move, next_history)
+        next_state = State(next_board, move, node, state.depth + 1)
+        if delta is not None:
+            next_state.h = state.h + delta(state.board, tile, move, state.blank_pos)
+        elif heuristic is not None:
+            next_state.h = heuristic(unpack_board(next_board, layout.h, layout.w))
         next_states.append(next_state)
     return next_states
 
 
+def get_goal_state(layout: Layout) -> State:
+    r"""
+    The root :class:`State` of a search backwards from the solved board.
+    """
+    return State(layout.goal, layout.h * layout.w - 1)
+
+
+def get_solution(
+        state: State, layout: Layout, nodes: NodeTable
+) -> list[tuple[int, int]]:
+    r"""
+    Rebuilds the list of (y, x)-coord moves leading to ``state``.
+    """
+    return [layout.coords[move] for move in nodes.path(state.node)]
+
+
+def mark_incomplete(
+        result: SearchResult, reason: str, best: PackedBoard, moves: list[int], layout: Layout
+) -> SearchResult:
+    r"""
+    Marks the result of a search that was stopped by a budget, recording the
+    closest state it reached (``best``) and the flat moves leading to it.
+    """
+    result.complete = False
+    result.stop_reason = reason
+    result.best = best
+    result.best_solution = [layout.coords[move] for move in moves]
+    return result
+
+
+def join_solution(
+        forward: State,
+        backward: State,
+        layout: Layout,
+        nodes: tuple[NodeTable, NodeTable],
+) -> list[tuple[int, int]]:
+    r"""
+    Stitches the moves from the initial board to a meeting state (``forward``)
+    with the reverse of the moves from the goal to that same state (``backward``).
+    """
+    moves = nodes[0].path(forward.node)
+    # blank positions from the goal to the meeting state
+    blanks = [layout.h * layout.w - 1] + nodes[1].path(backward.node)
+    # walking back to the goal, each move returns the blank to its previous position
+    moves.extend(reversed(blanks[:-1]))
+    return [layout.coords[move] for move in moves]
+
+
+@observed
 def a_star(board: Board, **kwargs) -> SearchResult:
     r"""
     Args:
@@ -39,9 +169,18 @@ def a_star(board: Board, **kwargs) -> SearchResult:
         f_bound (float): A limit on state cost. Default is :math:`\infty`.
         detect_dupes (bool): Duplicate detection (i.e. track visited states).
             Default is ``True``.
+        visited (str): The visited set, ``"set"`` or ``"bitset"`` (one bit per
+            reachable board, see :class:`visited.BitsetVisited`). Default is ``"set"``.
         heuristic: A function that maps boards to an estimated cost-to-go.
             Default is :func:`slidingpuzzle.heuristics.linear_conflict_distance`.
         weight (float): A constant multiplier on heuristic evaluation
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
 
     Returns:
         A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics
@@ -50,30 +189,55 @@ def a_star(board: Board, **kwargs) -> SearchResult:
     depth_bound = kwargs.get("depth_bound", float("inf"))
     f_bound = kwargs.get("f_bound", float("inf"))
     detect_dupes = kwargs.get("detect_dupes", True)
-    heuristic = kwargs.get("heuristic", manhattan_distance)
+    heuristic = kwargs.get("heuristic", linear_conflict_distance)
     weight = kwargs.get("weight", 1)
 
     # initial state
-    goal = new_board(*board.shape)
-    initial_state = State(np.copy(board), find_blank(board))
-    unvisited = [initial_state]
-    visited: set[FrozenBoard] = set()
+    layout = get_layout(*board.shape)
+    delta = get_heuristic_delta(heuristic, *board.shape)
+
+    # instrumentation
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    expand = monitor.wrap("expansion", get_next_states)
+    heuristic, delta = monitor.wrap("heuristic", heuristic), monitor.wrap("heuristic", delta)
+    check = monitor.check_interval
+
+    initial_state = get_initial_state(board)
+    initial_state.h = heuristic(board)
+    nodes = NodeTable()
+    unvisited = new_open_list(initial_state, weight, detect_dupes)
+    unvisited.push(initial_state)
+    push, pop = monitor.wrap("heap", unvisited.push), monitor.wrap("heap", unvisited.pop)
+    visited = new_visited(kwargs.get("visited", "set"), *board.shape)
+    monitor.track_visited(visited)
+    best = initial_state
 
     # stats
     generated, expanded = 0, 0
 
     while unvisited:
-        state = heapq.heappop(unvisited)
+        state = pop()
         expanded += 1
 
         # goal check
-        if np.array_equal(goal, state.board):
+        if state.board == layout.goal:
+            solution = get_solution(state, layout, nodes)
             return SearchResult(
-                board, generated, expanded, unvisited, visited, state.history
+                board, generated, expanded, unvisited, visited, solution
             )
 
+        # budget
+        if not expanded % check and monitor.update(
+                generated, expanded, len(unvisited), len(visited), state.f, len(nodes)
+        ):
+            break
+
+        # closest state so far, reported if the search is stopped
+        if state.h < best.h:
+            best = state
+
         # bound
-        if len(state.history) > depth_bound or state.f > f_bound:
+        if state.depth > depth_bound or state.f > f_bound:
             continue
 
         # duplicate detection
@@ -81,17 +245,441 @@ def a_star(board: Board, **kwargs) -> SearchResult:
             continue
 
         # children
-        next_states = get_next_states(state)
+        next_states = expand(state, layout, nodes, heuristic, delta)
         for state in next_states:
-            state.g = len(state.history)
-            state.f = state.g + weight * heuristic(state.board)
-            heapq.heappush(unvisited, state)
+            state.g = state.depth
+            state.f = state.g + weight * state.h
+            push(state)
         generated += len(next_states)
 
     # if we are here, no solution was found
-    return SearchResult(board, generated, expanded, unvisited, visited, None)
+    result = SearchResult(board, generated, expanded, unvisited, visited, None)
+    if monitor.stop_reason is not None:
+        moves = nodes.path(best.node)
+        mark_incomplete(result, monitor.stop_reason, best.board, moves, layout)
+    return result
 
 
+@observed
+def anytime_a_star(board: Board, **kwargs) -> Iterator[SearchResult]:
+    r"""
+    Anytime repairing A* (ARA*). Runs weighted A* with a decreasing weight and
+    yields each better solution as soon as it is found. Every iteration reuses
+    the states (and best `g` values) of the previous ones: only states whose
+    `g` improved after they were expanded are searched again.
+
+    Args:
+        board: The board
+        heuristic: A function that maps boards to an estimated cost-to-go.
+            Default is :func:`slidingpuzzle.heuristics.linear_conflict_distance`.
+        weight (float): The weight of the first iteration. Default is ``3``.
+        weight_step (float): How much the weight decreases each iteration,
+            down to ``1``. Default is ``0.5``.
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
+
+    Returns:
+        An iterator over :class:`slidingpuzzle.state.SearchResult` with shorter
+        solutions (or tighter bounds), each with its ``suboptimality`` bound. The
+        last one is optimal, if the heuristic is admissible. Stop iterating to
+        keep the best solution so far. If a budget runs out, the last result is
+        marked incomplete and holds the best solution found so far (if any).
+    """
+    # args
+    heuristic = kwargs.get("heuristic", linear_conflict_distance)
+    weight = kwargs.get("weight", 3)
+    weight_step = kwargs.get("weight_step", 0.5)
+
+    # initial state
+    layout = get_layout(*board.shape)
+    delta = get_heuristic_delta(heuristic, *board.shape)
+
+    # instrumentation
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    expand = monitor.wrap("expansion", get_next_states)
+    heuristic, delta = monitor.wrap("heuristic", heuristic), monitor.wrap("heuristic", delta)
+    check = monitor.check_interval
+
+    initial_state = get_initial_state(board)
+    initial_state.h = heuristic(board)
+    initial_state.f = weight * initial_state.h
+    nodes = NodeTable()
+    unvisited = [initial_state]
+    visited: set[PackedBoard] = set()
+    # the lowest-g state of every board generated
+    states = {initial_state.board: initial_state}
+    # states improved after being expanded in the current iteration
+    inconsistent: list[State] = []
+    goal = initial_state if initial_state.board == layout.goal else None
+    best = initial_state
+    last_len, last_bound = float("inf"), float("inf")
+
+    # stats
+    generated, expanded = 0, 0
+
+    while True:
+        # weighted A*, until no state left can lead to a shorter solution
+        while unvisited and (goal is None or goal.g > unvisited[0].f):
+            state = heapq.heappop(unvisited)
+
+            # duplicate detection (a shorter path to this board was found later)
+            if states[state.board] is not state:
+                continue
+            expanded += 1
+
+            # budget (the state goes back, as it still bounds the optimal length)
+            if not expanded % check and monitor.update(
+                    generated, expanded, len(unvisited), len(visited), state.f, len(nodes)
+            ):
+                heapq.heappush(unvisited, state)
+                break
+            visited.add(state.board)
+
+            # closest state so far, reported if the search is stopped
+            if state.h < best.h:
+                best = state
+
+            # children
+            next_states = expand(state, layout, nodes, heuristic, delta)
+            generated += len(next_states)
+            for next_state in next_states:
+                known = states.get(next_state.board, None)
+                if known is not None and known.depth <= next_state.depth:
+                    continue
+                states[next_state.board] = next_state
+                next_state.g = next_state.depth
+                if next_state.board == layout.goal:
+                    goal = next_state
+                if next_state.board in visited:
+                    inconsistent.append(next_state)
+                else:
+                    next_state.f = next_state.g + weight * next_state.h
+                    heapq.heappush(unvisited, next_state)
+
+        if goal is None:
+            if monitor.stop_reason is not None:
+                result = SearchResult(board, generated, expanded, unvisited, visited, None)
+                moves = nodes.path(best.node)
+                yield mark_incomplete(result, monitor.stop_reason, best.board, moves, layout)
+            return
+
+        # the optimal length is at least the lowest g + h of the states left
+        lower = min(
+            (
+                state.g + state.h
+                for state in itertools.chain(unvisited, inconsistent)
+                if states[state.board] is state
+            ),
+            default=goal.g,
+        )
+        bound = max(1.0, min(weight, goal.g / lower)) if lower else 1.0
+        if monitor.stop_reason is not None:
+            # the best solution so far, even if it was already reported
+            solution = get_solution(goal, layout, nodes)
+            result = SearchResult(
+                board, generated, expanded, unvisited, visited, solution, suboptimality=bound
+            )
+            moves = nodes.path(goal.node)
+            yield mark_incomplete(result, monitor.stop_reason, goal.board, moves, layout)
+            return
+        if goal.g < last_len or bound < last_bound:
+            last_len, last_bound = goal.g, bound
+            solution = get_solution(goal, layout, nodes)
+            yield SearchResult(
+                board, generated, expanded, unvisited, visited, solution, suboptimality=bound
+            )
+        if bound <= 1 or weight <= 1:
+            return
+
+        # re-key the open list with the lower weight, adding back the improved states
+        weight = max(1, weight - weight_step)
+        unvisited = [
+            state
+            for state in itertools.chain(unvisited, inconsistent)
+            if states[state.board] is state
+        ]
+        for state in unvisited:
+            state.f = state.g + weight * state.h
+        heapq.heapify(unvisited)
+        inconsistent = []
+        visited = set()
+
+
+@observed
+def parallel_a_star(board: Board, **kwargs) -> SearchResult:
+    r"""
+    Hash-distributed A* (HDA*). Every worker process owns the boards whose
+    :func:`get_owner` is its index and runs A* on them: children owned by
+    another worker are sent to it in batches, and the cost of the best solution
+    found so far is shared so that every worker prunes the states that can't
+    improve it. The search ends once every worker is idle and every batch sent
+    was received, and the moves are rebuilt by asking the owner of each board
+    for the blank position of its parent.
+
+    Args:
+        board: The board
+        workers (int): The number of worker processes. Default is the number of CPUs.
+        depth_bound (int): A limit to search depth. Default is :math:`\infty`.
+        heuristic: A function that maps boards to an estimated cost-to-go.
+            Default is :func:`slidingpuzzle.heuristics.linear_conflict_distance`.
+        weight (float): A constant multiplier on heuristic evaluation
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
+
+    Returns:
+        A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics
+    """
+    # args
+    workers = kwargs.get("workers", None) or os.cpu_count()
+    depth_bound = kwargs.get("depth_bound", float("inf"))
+    heuristic = kwargs.get("heuristic", linear_conflict_distance)
+    weight = kwargs.get("weight", 1)
+
+    # initial state, evaluated before the workers start so that tables saved to
+    # disk are built once (see _prepare_shared_tables)
+    layout = get_layout(*board.shape)
+    initial_state = get_initial_state(board)
+    h = heuristic(board)
+
+    # workers, each with its own inbox
+    context = multiprocessing.get_context()
+    inboxes = [context.Queue() for _ in range(workers)]
+    outbox = context.Queue()
+    incumbent = context.Value("d", float("inf"))
+    stop = context.Event()
+    processes = [
+        context.Process(
+            target=_hda_worker,
+            args=(i, board.shape, heuristic, weight, depth_bound, inboxes, outbox, incumbent, stop),
+            daemon=True,
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    root = (weight * h, 0, initial_state.board, initial_state.blank_pos, -1, h)
+    inboxes[get_owner(initial_state.board, workers)].put(("states", [root]))
+
+    # instrumentation
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+
+    # the last status of every worker, and the totals of the last balanced round
+    status = [(False, 0, 0, 0, 0, 0, 0, float("inf"), 0)] * workers
+    status[get_owner(initial_state.board, workers)] = (False, 0, 0, 0, 0, 0, 0, h, initial_state.board)
+    balanced, fresh = None, set()
+    try:
+        while True:
+            message = outbox.get()
+            if message[0] == "status":
+                status[message[1]] = message[2:]
+                fresh.add(message[1])
+            idle, sent, received, expanded, generated, open_size, visited = (
+                sum(column) for column in zip(*(s[:7] for s in status))
+            )
+            # the initial state was sent from here
+            sent += 1
+
+            # budget
+            if monitor.update(generated, expanded, open_size, visited, incumbent.value) is not None:
+                break
+
+            # termination: all idle, all batches received, twice in a row
+            if idle < workers or sent != received:
+                balanced = None
+            elif balanced is None or balanced != (sent, received):
+                balanced, fresh = (sent, received), set()
+            elif len(fresh) == workers:
+                break
+    finally:
+        stop.set()
+
+    def parent_blank(packed: PackedBoard) -> int:
+        inboxes[get_owner(packed, workers)].put(("parent", packed))
+        while True:
+            message = outbox.get()
+            if message[0] == "parent":
+                return message[1]
+
+    def path(packed: PackedBoard, blank: int) -> list[int]:
+        moves = []
+        parent = parent_blank(packed)
+        while parent >= 0:
+            moves.append(blank)
+            # move the blank back to where it was on the parent board
+            for move, shift, factor in layout.moves[blank]:
+                if move == parent:
+                    tile = (packed >> shift) & layout.mask
+                    packed += tile * factor
+            blank, parent = parent, parent_blank(packed)
+        moves.reverse()
+        return moves
+
+    solution = None
+    if monitor.stop_reason is None and incumbent.value < float("inf"):
+        solution = [layout.coords[move] for move in path(layout.goal, layout.h * layout.w - 1)]
+    best_h, best_board = min((s[7], s[8]) for s in status)
+    best_moves = path(best_board, find_packed_blank(best_board, layout)) if monitor.stop_reason else []
+
+    # collect the frontier and visited states of every worker
+    unvisited, visited = [], set()
+    for inbox in inboxes:
+        inbox.put(("finish",))
+    for _ in processes:
+        message = outbox.get()
+        while message[0] != "final":
+            message = outbox.get()
+        unvisited.extend(message[1])
+        visited.update(message[2])
+    for process in processes:
+        process.join()
+
+    generated, expanded = sum(s[4] for s in status), sum(s[3] for s in status)
+    result = SearchResult(board, generated, expanded, unvisited, visited, solution)
+    if monitor.stop_reason is not None:
+        mark_incomplete(result, monitor.stop_reason, best_board, best_moves, layout)
+    return result
+
+
+def get_owner(packed: PackedBoard, workers: int) -> int:
+    r"""
+    The worker that owns a board in :func:`parallel_a_star`, from a
+    multiplicative hash of the packed board.
+    """
+    return (((packed * HASH_MULTIPLIER) & HASH_MASK) >> 32) % workers
+
+
+def _hda_worker(
+        index: int,
+        shape: tuple[int, int],
+        heuristic: Heuristic,
+        weight: float,
+        depth_bound: float,
+        inboxes: list,
+        outbox,
+        incumbent,
+        stop,
+) -> None:
+    workers = len(inboxes)
+    layout = get_layout(*shape)
+    delta = get_heuristic_delta(heuristic, *shape)
+    # (f, -g, board, blank, parent blank, h) entries, and the g and parent blank
+    # of every board expanded or queued
+    unvisited: list[tuple] = []
+    known: dict[PackedBoard, tuple[int, int]] = {}
+    visited: set[PackedBoard] = set()
+    outgoing: list[list[tuple]] = [[] for _ in range(workers)]
+    sent, received, expanded, generated = 0, 0, 0, 0
+    best_h, best_board = float("inf"), 0
+    last_report = 0.0
+
+    def push(entry: tuple) -> None:
+        _, g, board, _, parent, _ = entry
+        g = -g
+        previous = known.get(board, None)
+        if previous is not None and previous[0] <= g:
+            return
+        known[board] = (g, parent)
+        visited.discard(board)
+        heapq.heappush(unvisited, entry)
+
+    while True:
+        # messages, waiting for one only when there is nothing to expand
+        idle = stop.is_set() or not unvisited
+        try:
+            message = inboxes[index].get(timeout=HDA_IDLE_WAIT) if idle else inboxes[index].get_nowait()
+        except queue.Empty:
+            message = None
+        if message is not None:
+            kind = message[0]
+            if kind == "states":
+                received += len(message[1])
+                for entry in message[1]:
+                    push(entry)
+            elif kind == "parent":
+                outbox.put(("parent", known[message[1]][1]))
+            elif kind == "finish":
+                outbox.put((
+                    "final",
+                    [State(e[2], e[3], 0, -e[1], e[5], e[0], -e[1]) for e in unvisited
+                     if known[e[2]][0] == -e[1] and e[2] not in visited],
+                    visited,
+                ))
+                return
+            continue
+
+        if not stop.is_set():
+            for _ in range(HDA_BATCH):
+                if not unvisited:
+                    break
+                f, g, board, blank, _, h = heapq.heappop(unvisited)
+                g = -g
+                # duplicate detection (a shorter path to this board was found later)
+                if known[board][0] != g or board in visited:
+                    continue
+                # nothing left here can lead to a shorter solution
+                if f >= incumbent.value:
+                    unvisited.clear()
+                    break
+                visited.add(board)
+                expanded += 1
+                if h < best_h:
+                    best_h, best_board = h, board
+
+                # goal check
+                if board == layout.goal:
+                    with incumbent.get_lock():
+                        incumbent.value = min(incumbent.value, g)
+                    continue
+
+                # bound
+                if g >= depth_bound:
+                    continue
+
+                # children
+                for move, shift, factor in layout.moves[blank]:
+                    tile = (board >> shift) & layout.mask
+                    next_board = board + tile * factor
+                    if delta is not None:
+                        next_h = h + delta(board, tile, move, blank)
+                    else:
+                        next_h = heuristic(unpack_board(next_board, layout.h, layout.w))
+                    entry = (g + 1 + weight * next_h, -(g + 1), next_board, move, blank, next_h)
+                    owner = get_owner(next_board, workers)
+                    if owner == index:
+                        push(entry)
+                    else:
+                        outgoing[owner].append(entry)
+                    generated += 1
+
+            # send the batches
+            for owner, entries in enumerate(outgoing):
+                if entries:
+                    inboxes[owner].put(("states", entries))
+                    sent += len(entries)
+                    outgoing[owner] = []
+
+        # status
+        now = time.perf_counter()
+        idle = stop.is_set() or not unvisited
+        if idle or now - last_report >= HDA_REPORT_INTERVAL:
+            last_report = now
+            outbox.put((
+                "status", index, idle, sent, received, expanded, generated,
+                len(unvisited), len(visited), best_h, best_board,
+            ))
+
+
+@observed
 def bfs(board: Board, **kwargs) -> SearchResult:
     r"""
     Breadth-first search
@@ -101,6 +689,15 @@ def bfs(board: Board, **kwargs) -> SearchResult:
         depth_bound (int): A limit to search depth. Default is :math:`\infty`.
         detect_dupes (bool): Duplicate detection (i.e. track visited states).
             Default is ``True``.
+        visited (str): The visited set, ``"set"`` or ``"bitset"`` (one bit per
+            reachable board, see :class:`visited.BitsetVisited`). Default is ``"set"``.
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
 
     Returns:
         A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics
@@ -110,10 +707,23 @@ def bfs(board: Board, **kwargs) -> SearchResult:
     detect_dupes = kwargs.get("detect_dupes", True)
 
     # initial state
-    goal = new_board(*board.shape)
-    initial_state = State(np.copy(board), find_blank(board))
+    layout = get_layout(*board.shape)
+    initial_state = get_initial_state(board)
+    nodes = NodeTable()
     unvisited = collections.deque([initial_state])
-    visited: set[FrozenBoard] = set()
+
+    # instrumentation
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    expand = monitor.wrap("expansion", get_next_states)
+    check = monitor.check_interval
+
+    # with a budget, states are scored so the closest one can be reported
+    score = manhattan_distance if monitor.limited else None
+    score_delta = get_heuristic_delta(score, *board.shape) if score else None
+    initial_state.h = score(board) if score else 0
+    visited = new_visited(kwargs.get("visited", "set"), *board.shape)
+    monitor.track_visited(visited)
+    best = initial_state
 
     # stats
     generated, expanded = 0, 0
@@ -123,13 +733,24 @@ def bfs(board: Board, **kwargs) -> SearchResult:
         expanded += 1
 
         # goal check
-        if np.array_equal(goal, state.board):
+        if state.board == layout.goal:
+            solution = get_solution(state, layout, nodes)
             return SearchResult(
-                board, generated, expanded, unvisited, visited, state.history
+                board, generated, expanded, unvisited, visited, solution
             )
 
+        # budget
+        if not expanded % check and monitor.update(
+                generated, expanded, len(unvisited), len(visited), state.depth, len(nodes)
+        ):
+            break
+
+        # closest state so far, reported if the search is stopped
+        if state.h < best.h:
+            best = state
+
         # bound
-        if len(state.history) > depth_bound:
+        if state.depth > depth_bound:
             continue
 
         # duplicate detection
@@ -137,14 +758,258 @@ def bfs(board: Board, **kwargs) -> SearchResult:
             continue
 
         # children
-        next_states = get_next_states(state)
+        next_states = expand(state, layout, nodes, score, score_delta)
         unvisited.extend(next_states)
         generated += len(next_states)
 
     # if we are here, no solution was found
-    return SearchResult(board, generated, expanded, unvisited, visited, None)
+    result = SearchResult(board, generated, expanded, unvisited, visited, None)
+    if monitor.stop_reason is not None:
+        moves = nodes.path(best.node)
+        mark_incomplete(result, monitor.stop_reason, best.board, moves, layout)
+    return result
+
 
+@observed
+def vectorized_bfs(board: Board, **kwargs) -> SearchResult:
+    r"""
+    Level-synchronous breadth-first search on NumPy arrays. Each level is a
+    sorted array of board keys (see :func:`frontier.get_key_dtype`): all the children of a level are generated at
+    once (see :func:`frontier.expand_frontier`), deduplicated with ``np.unique``
+    and against the previous level only, since the puzzle's state graph is
+    bipartite (a child is never on its parent's level). The moves are rebuilt by
+    walking back through the levels, so no back-pointers are stored.
 
+    Args:
+        board: The board
+        depth_bound (int): A limit to search depth. Default is :math:`\infty`.
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
+
+    Returns:
+        A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics.
+        ``unvisited`` and ``visited`` are arrays of board keys.
+    """
+    # args
+    depth_bound = kwargs.get("depth_bound", float("inf"))
+
+    # initial state
+    layout = get_layout(*board.shape)
+    check_layout(layout)
+    initial_state = get_initial_state(board)
+    goal = encode_boards([layout.goal], layout)
+    frontier = encode_boards([initial_state.board], layout)
+    blanks = np.array([initial_state.blank_pos], dtype=np.int64)
+    levels = [frontier]
+
+    # instrumentation, each state costs its key per level it is kept on, and
+    # about 96 bytes of temporaries while its level is being expanded
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    monitor.set_entry_bytes(96, frontier.itemsize)
+    expand = monitor.wrap("expansion", expand_frontier)
+    score = monitor.wrap("heuristic", manhattan_distances)
+    # with a budget, levels are scored so the closest state can be reported
+    best = (0, initial_state.board, initial_state.blank_pos)
+    best_h = manhattan_distance(board) if monitor.limited else 0
+
+    # stats
+    generated, expanded, visited = 0, 0, 1
+
+    while len(frontier) and not (frontier == goal).any():
+        # bound
+        if len(levels) > depth_bound:
+            break
+
+        # budget
+        if monitor.update(generated, expanded, len(frontier), visited, len(levels) - 1):
+            break
+
+        # children
+        children, child_blanks, _ = expand(frontier, blanks, layout)
+        expanded += len(frontier)
+        generated += len(children)
+
+        # duplicate detection
+        children, first = np.unique(children, return_index=True)
+        child_blanks = child_blanks[first]
+        previous = levels[-2] if len(levels) > 1 else levels[0][:0]
+        new = ~contains_sorted(children, previous)
+        frontier, blanks = children[new], child_blanks[new]
+        levels.append(frontier)
+        visited += len(frontier)
+
+        # closest state so far, reported if the search is stopped
+        if monitor.limited and len(frontier):
+            h = score(frontier, layout)
+            i = int(np.argmin(h))
+            if h[i] < best_h:
+                best_h, best = h[i], (len(levels) - 1, decode_board(frontier[i], layout), int(blanks[i]))
+
+    visited = np.concatenate(levels)
+    if len(frontier) and (frontier == goal).any():
+        moves = level_path(levels, len(levels) - 1, layout.goal, layout.h * layout.w - 1, layout)
+        solution = [layout.coords[move] for move in moves]
+        return SearchResult(board, generated, expanded, frontier, visited, solution)
+
+    # if we are here, no solution was found
+    result = SearchResult(board, generated, expanded, frontier, visited, None)
+    if monitor.stop_reason is not None:
+        moves = level_path(levels, *best, layout)
+        mark_incomplete(result, monitor.stop_reason, best[1], moves, layout)
+    return result
+
+
+def level_path(
+        levels: list[npt.NDArray],
+        depth: int,
+        board: PackedBoard,
+        blank: int,
+        layout: Layout,
+) -> list[int]:
+    r"""
+    Rebuilds the flat moves to a board of the BFS level ``depth`` by finding, for
+    each level, a neighbour of the current board on the level before it.
+    """
+    moves = []
+    current = encode_boards([board], layout)
+    blanks = np.array([blank], dtype=np.int64)
+    for level in reversed(levels[:depth]):
+        moves.append(int(blanks[0]))
+        children, child_blanks, _ = expand_frontier(current, blanks, layout)
+        i = np.flatnonzero(contains_sorted(children, level))[0]
+        current, blanks = children[i:i + 1], child_blanks[i:i + 1]
+    moves.reverse()
+    return moves
+
+
+@observed
+def external_bfs(board: Board, **kwargs) -> SearchResult:
+    r"""
+    External-memory breadth-first search. Each level is written to a file of
+    sorted board keys (see :mod:`external_bfs`), expanded one chunk at a time
+    into sorted runs, and the runs are merged with the two levels before it to
+    remove duplicates. Memory use is bounded by ``chunk_size`` instead of the
+    number of states. The moves are rebuilt with :func:`level_path` over the
+    memory-mapped level files.
+
+    Args:
+        board: The board
+        depth_bound (int): A limit to search depth. Default is :math:`\infty`.
+        directory (str): Where level files are written. Default is the system's
+            temporary directory.
+        keep_layers (bool): Keep the level files once the search ends. Default
+            is ``False``.
+        chunk_size (int): The number of boards held in memory at once. Default is
+            :data:`external_bfs.CHUNK_SIZE`.
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+
+    Returns:
+        A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics.
+        ``unvisited`` and ``visited`` are :class:`external_bfs.LayerFiles`.
+
+    Raises:
+        ValueError: If given a ``memory_limit``. The states are on disk, so
+            memory is bounded by ``chunk_size`` instead.
+    """
+    # args
+    depth_bound = kwargs.get("depth_bound", float("inf"))
+    keep_layers = kwargs.get("keep_layers", False)
+    chunk_size = kwargs.get("chunk_size", CHUNK_SIZE)
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    if getattr(monitor, "memory_limit", None) is not None:
+        raise ValueError(
+            "external_bfs keeps its states on disk, bound its memory with chunk_size instead of memory_limit"
+        )
+
+    # initial state
+    layout = get_layout(*board.shape)
+    check_layout(layout)
+    initial_state = get_initial_state(board)
+    goal = encode_boards([layout.goal], layout)
+
+    # instrumentation, states are on disk and only a chunk is held in memory
+    monitor.set_entry_bytes(0, 0)
+    expand = monitor.wrap("expansion", expand_layer)
+    merge = monitor.wrap("duplicates", merge_runs)
+    score = monitor.wrap("heuristic", manhattan_distances)
+    # with a budget, levels are scored so the closest state can be reported
+    best = (0, initial_state.board, initial_state.blank_pos)
+    best_h = manhattan_distance(board) if monitor.limited else 0
+
+    # stats
+    generated, expanded = 0, 0
+
+    def found() -> bool:
+        return bool(contains_sorted(goal, load_layer(get_layer_path(directory, len(sizes) - 1), layout))[0])
+
+    # the level files, removed in the end unless they are kept
+    directory = tempfile.mkdtemp(prefix="bfs_", dir=kwargs.get("directory", None))
+    try:
+        sizes = [write_initial_layer(directory, [initial_state.board], layout)]
+        while sizes[-1] and not found():
+            depth = len(sizes) - 1
+
+            # bound
+            if depth >= depth_bound:
+                break
+
+            # children
+            runs = []
+            for run, n_expanded, n_generated in expand(get_layer_path(directory, depth), layout, chunk_size):
+                runs.append(run)
+                expanded += n_expanded
+                generated += n_generated
+                # budget
+                if monitor.update(generated, expanded, sizes[-1], sum(sizes), depth):
+                    break
+            if monitor.stop_reason is not None:
+                for run in runs:
+                    os.remove(run)
+                break
+
+            # duplicate detection
+            exclude = tuple(get_layer_path(directory, d) for d in (depth, depth - 1) if d >= 0)
+            sizes.append(merge(runs, get_layer_path(directory, depth + 1), layout, exclude, chunk_size))
+
+            # closest state so far, reported if the search is stopped
+            if monitor.limited:
+                for boards in iter_layer(get_layer_path(directory, depth + 1), layout, chunk_size):
+                    h = score(boards, layout)
+                    i = int(np.argmin(h))
+                    if h[i] < best_h:
+                        blank = int(find_blanks(boards[i:i + 1], layout)[0])
+                        best_h, best = h[i], (depth + 1, decode_board(boards[i], layout), blank)
+
+        paths = [get_layer_path(directory, d) for d in range(len(sizes))]
+        levels = [load_layer(path, layout) for path in paths]
+        visited = LayerFiles(paths, sizes, layout)
+        unvisited = LayerFiles(paths[-1:], sizes[-1:], layout)
+        if sizes[-1] and found():
+            moves = level_path(levels, len(levels) - 1, layout.goal, layout.h * layout.w - 1, layout)
+            solution = [layout.coords[move] for move in moves]
+            return SearchResult(board, generated, expanded, unvisited, visited, solution)
+
+        # if we are here, no solution was found
+        result = SearchResult(board, generated, expanded, unvisited, visited, None)
+        if monitor.stop_reason is not None:
+            moves = level_path(levels, *best, layout)
+            mark_incomplete(result, monitor.stop_reason, best[1], moves, layout)
+        return result
+    finally:
+        if not keep_layers:
+            shutil.rmtree(directory)
+
+
+@observed
 def dfs(board: Board, **kwargs) -> SearchResult:
     r"""
     Depth-first search
@@ -154,6 +1019,15 @@ def dfs(board: Board, **kwargs) -> SearchResult:
         depth_bound (int): A limit to search depth. Default is :math:`\infty`.
         detect_dupes (bool): Duplicate detection (i.e. track visited states).
             Default is ``True``.
+        visited (str): The visited set, ``"set"`` or ``"bitset"`` (one bit per
+            reachable board, see :class:`visited.BitsetVisited`). Default is ``"set"``.
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
 
     Returns:
         A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics
@@ -163,10 +1037,23 @@ def dfs(board: Board, **kwargs) -> SearchResult:
     detect_dupes = kwargs.get("detect_dupes", True)
 
     # initial state
-    goal = new_board(*board.shape)
-    initial_state = State(np.copy(board), find_blank(board))
+    layout = get_layout(*board.shape)
+    initial_state = get_initial_state(board)
+    nodes = NodeTable()
     unvisited = [initial_state]
-    visited: set[FrozenBoard] = set()
+    visited = new_visited(kwargs.get("visited", "set"), *board.shape)
+
+    # instrumentation
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    expand = monitor.wrap("expansion", get_next_states)
+    check = monitor.check_interval
+    monitor.track_visited(visited)
+
+    # with a budget, states are scored so the closest one can be reported
+    score = manhattan_distance if monitor.limited else None
+    score_delta = get_heuristic_delta(score, *board.shape) if score else None
+    initial_state.h = score(board) if score else 0
+    best = initial_state
 
     # stats
     generated, expanded = 0, 0
@@ -176,13 +1063,24 @@ def dfs(board: Board, **kwargs) -> SearchResult:
         expanded += 1
 
         # goal check
-        if np.array_equal(goal, state.board):
+        if state.board == layout.goal:
+            solution = get_solution(state, layout, nodes)
             return SearchResult(
-                board, generated, expanded, unvisited, visited, state.history
+                board, generated, expanded, unvisited, visited, solution
             )
 
+        # budget
+        if not expanded % check and monitor.update(
+                generated, expanded, len(unvisited), len(visited), state.depth, len(nodes)
+        ):
+            break
+
+        # closest state so far, reported if the search is stopped
+        if state.h < best.h:
+            best = state
+
         # bound
-        if len(state.history) > depth_bound:
+        if state.depth > depth_bound:
             continue
 
         # duplicate detection
@@ -190,14 +1088,19 @@ def dfs(board: Board, **kwargs) -> SearchResult:
             continue
 
         # children
-        next_states = get_next_states(state)
+        next_states = expand(state, layout, nodes, score, score_delta)
         unvisited.extend(next_states)
         generated += len(next_states)
 
     # if we are here, no solution was found
-    return SearchResult(board, generated, expanded, unvisited, visited, None)
+    result = SearchResult(board, generated, expanded, unvisited, visited, None)
+    if monitor.stop_reason is not None:
+        moves = nodes.path(best.node)
+        mark_incomplete(result, monitor.stop_reason, best.board, moves, layout)
+    return result
 
 
+@observed
 def greedy(board: Board, **kwargs) -> SearchResult:
     r"""
     Greedy best-first search. This search orders all known states using the provided
@@ -209,38 +1112,70 @@ def greedy(board: Board, **kwargs) -> SearchResult:
         f_bound (float): A limit on state cost. Default is :math:`\infty`.
         detect_dupes (bool): Duplicate detection (i.e. track visited states).
             Default is ``True``.
+        visited (str): The visited set, ``"set"`` or ``"bitset"`` (one bit per
+            reachable board, see :class:`visited.BitsetVisited`). Default is ``"set"``.
         heuristic: A function that maps boards to an estimated cost-to-go.
             Default is :func:`slidingpuzzle.heuristics.linear_conflict_distance`.
-
-
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
     """
     # args
     depth_bound = kwargs.get("depth_bound", float("inf"))
     f_bound = kwargs.get("f_bound", float("inf"))
     detect_dupes = kwargs.get("detect_dupes", True)
-    heuristic = kwargs.get("heuristic", manhattan_distance)
+    heuristic = kwargs.get("heuristic", linear_conflict_distance)
 
     # initial state
-    goal = new_board(*board.shape)
-    initial_state = State(np.copy(board), find_blank(board))
-    unvisited = [initial_state]
-    visited: set[FrozenBoard] = set()
+    layout = get_layout(*board.shape)
+    delta = get_heuristic_delta(heuristic, *board.shape)
+
+    # instrumentation
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    expand = monitor.wrap("expansion", get_next_states)
+    heuristic, delta = monitor.wrap("heuristic", heuristic), monitor.wrap("heuristic", delta)
+    check = monitor.check_interval
+
+    initial_state = get_initial_state(board)
+    initial_state.h = heuristic(board)
+    nodes = NodeTable()
+    unvisited = new_open_list(initial_state, detect_dupes=detect_dupes)
+    unvisited.push(initial_state)
+    push, pop = monitor.wrap("heap", unvisited.push), monitor.wrap("heap", unvisited.pop)
+    visited = new_visited(kwargs.get("visited", "set"), *board.shape)
+    monitor.track_visited(visited)
+    best = initial_state
 
     # stats
     generated, expanded = 0, 0
 
     while unvisited:
-        state = heapq.heappop(unvisited)
+        state = pop()
         expanded += 1
 
         # goal check
-        if np.array_equal(goal, state.board):
+        if state.board == layout.goal:
+            solution = get_solution(state, layout, nodes)
             return SearchResult(
-                board, generated, expanded, unvisited, visited, state.history
+                board, generated, expanded, unvisited, visited, solution
             )
 
+        # budget
+        if not expanded % check and monitor.update(
+                generated, expanded, len(unvisited), len(visited), state.f, len(nodes)
+        ):
+            break
+
+        # closest state so far, reported if the search is stopped
+        if state.h < best.h:
+            best = state
+
         # bound
-        if len(state.history) > depth_bound or state.f > f_bound:
+        if state.depth > depth_bound or state.f > f_bound:
             continue
 
         # duplicate detection
@@ -248,15 +1183,20 @@ def greedy(board: Board, **kwargs) -> SearchResult:
             continue
 
         # children
-        next_states = get_next_states(state)
+        next_states = expand(state, layout, nodes, heuristic, delta)
         for state in next_states:
-            state.f = heuristic(state.board)
-            heapq.heappush(unvisited, state)
+            state.f = state.h
+            push(state)
         generated += len(next_states)
 
     # if we are here, no solution was found
-    return SearchResult(board, generated, expanded, unvisited, visited, None)
+    result = SearchResult(board, generated, expanded, unvisited, visited, None)
+    if monitor.stop_reason is not None:
+        moves = nodes.path(best.node)
+        mark_incomplete(result, monitor.stop_reason, best.board, moves, layout)
+    return result
 
+@observed
 def dijkistra(board: Board, **kwargs) -> SearchResult:
     r"""
     Dijkistra search. This search orders all known states using the provided
@@ -267,35 +1207,69 @@ def dijkistra(board: Board, **kwargs) -> SearchResult:
         depth_bound (int): A limit to search depth. Default is :math:`\infty`.
         detect_dupes (bool): Duplicate detection (i.e. track visited states).
             Default is ``True``.
+        visited (str): The visited set, ``"set"`` or ``"bitset"`` (one bit per
+            reachable board, see :class:`visited.BitsetVisited`). Default is ``"set"``.
         heuristic: A function that maps boards to an estimated cost-to-go.
             Default is :func:`slidingpuzzle.heuristics.linear_conflict_distance`.
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
     """
     # args
     depth_bound = kwargs.get("depth_bound", float("inf"))
     detect_dupes = kwargs.get("detect_dupes", True)
-    heuristic = kwargs.get("heuristic", manhattan_distance)
+    heuristic = kwargs.get("heuristic", linear_conflict_distance)
 
     # initial state
-    goal = new_board(*board.shape)
-    initial_state = State(np.copy(board), find_blank(board))
-    unvisited = [initial_state]
-    visited: set[FrozenBoard] = set()
+    layout = get_layout(*board.shape)
+    delta = get_heuristic_delta(heuristic, *board.shape)
+
+    # instrumentation
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    expand = monitor.wrap("expansion", get_next_states)
+    heuristic, delta = monitor.wrap("heuristic", heuristic), monitor.wrap("heuristic", delta)
+    check = monitor.check_interval
+
+    initial_state = get_initial_state(board)
+    initial_state.h = heuristic(board)
+    nodes = NodeTable()
+    unvisited = new_open_list(initial_state, detect_dupes=detect_dupes)
+    unvisited.push(initial_state)
+    push, pop = monitor.wrap("heap", unvisited.push), monitor.wrap("heap", unvisited.pop)
+    visited = new_visited(kwargs.get("visited", "set"), *board.shape)
+    monitor.track_visited(visited)
+    best = initial_state
 
     # stats
     generated, expanded = 0, 0
 
     while unvisited:
-        state = heapq.heappop(unvisited)
+        state = pop()
         expanded += 1
 
         # goal check
-        if np.array_equal(goal, state.board):
+        if state.board == layout.goal:
+            solution = get_solution(state, layout, nodes)
             return SearchResult(
-                board, generated, expanded, unvisited, visited, state.history
+                board, generated, expanded, unvisited, visited, solution
             )
 
+        # budget
+        if not expanded % check and monitor.update(
+                generated, expanded, len(unvisited), len(visited), state.f, len(nodes)
+        ):
+            break
+
+        # closest state so far, reported if the search is stopped
+        if state.h < best.h:
+            best = state
+
         # bound
-        if len(state.history) > depth_bound:
+        if state.depth > depth_bound:
             continue
 
         # duplicate detection
@@ -303,39 +1277,841 @@ def dijkistra(board: Board, **kwargs) -> SearchResult:
             continue
 
         # children
-        next_states = get_next_states(state)
+        next_states = expand(state, layout, nodes, heuristic, delta)
         for state in next_states:
-            state.f = heuristic(state.board)
-            heapq.heappush(unvisited, state)
+            state.f = state.h
+            push(state)
         generated += len(next_states)
 
     # if we are here, no solution was found
-    return SearchResult(board, generated, expanded, unvisited, visited, None)
+    result = SearchResult(board, generated, expanded, unvisited, visited, None)
+    if monitor.stop_reason is not None:
+        moves = nodes.path(best.node)
+        mark_incomplete(result, monitor.stop_reason, best.board, moves, layout)
+    return result
+
+
+@observed
+def ida_star(board: Board, **kwargs) -> SearchResult:
+    r"""
+    Iterative deepening A*. Repeats a depth-first search bounded by `f`, raising
+    the bound to the smallest `f` that exceeded it, until the goal is found. Only
+    the current path is kept in memory: the board is mutated in place and the
+    move is undone on backtracking, and the blank never moves straight back.
+
+    Args:
+        board: The board
+        depth_bound (int): A limit to search depth. Default is :math:`\infty`.
+        f_bound (float): A limit on state cost. Default is :math:`\infty`.
+        heuristic: A function that maps boards to an estimated cost-to-go.
+            Default is :func:`slidingpuzzle.heuristics.linear_conflict_distance`.
+        weight (float): A constant multiplier on heuristic evaluation
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
+
+    Returns:
+        A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics
+    """
+    # args
+    depth_bound = kwargs.get("depth_bound", float("inf"))
+    f_bound = kwargs.get("f_bound", float("inf"))
+    heuristic = kwargs.get("heuristic", linear_conflict_distance)
+    weight = kwargs.get("weight", 1)
+
+    # initial state
+    layout = get_layout(*board.shape)
+    delta = get_heuristic_delta(heuristic, *board.shape)
+    initial_state = get_initial_state(board)
+    current = initial_state.board
+    path: list[int] = []
+
+    # stats
+    generated, expanded = 0, 0
+
+    def bounded_dfs(blank: int, g: int, h: int | float, prev: int) -> int | float:
+        nonlocal current, generated, expanded, best_h, best_board, best_path
+        f = g + weight * h
+        if f > bound:
+            return f
+        expanded += 1
+
+        # goal check
+        if current == layout.goal:
+            return IDA_FOUND
+
+        # budget
+        if not expanded % check and monitor.update(generated, expanded, len(path), 0, bound):
+            return IDA_CANCELLED
+
+        # closest state so far, reported if the search is stopped
+        if h < best_h:
+            best_h, best_board, best_path = h, current, path.copy()
+
+        # bound
+        if g > depth_bound:
+            return float("inf")
+
+        # children
+        next_bound = float("inf")
+        for move, shift, factor in layout.moves[blank]:
+            # parent-move pruning
+            if move == prev:
+                continue
+            tile = (current >> shift) & layout.mask
+            if delta is not None:
+                next_h = h + delta(current, tile, move, blank)
+            current += tile * factor
+            if delta is None:
+                next_h = heuristic(unpack_board(current, layout.h, layout.w))
+            path.append(move)
+            generated += 1
+            t = bounded_dfs(move, g + 1, next_h, blank)
+            # found or stopped
+            if t < 0:
+                return t
+            # undo
+            path.pop()
+            current -= tile * factor
+            next_bound = min(next_bound, t)
+        return next_bound
+
+    # instrumentation, the expansion time of each call excludes its children
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    bounded_dfs = monitor.wrap("expansion", bounded_dfs)
+    heuristic, delta = monitor.wrap("heuristic", heuristic), monitor.wrap("heuristic", delta)
+    check = monitor.check_interval
+
+    initial_state.h = heuristic(board)
+    best_h, best_board, best_path = initial_state.h, current, []
+    bound = weight * initial_state.h
+    while bound <= f_bound:
+        bound = bounded_dfs(initial_state.blank_pos, 0, initial_state.h, -1)
+        if bound == IDA_FOUND:
+            solution = [layout.coords[move] for move in path]
+            return SearchResult(board, generated, expanded, [], set(), solution)
+        if bound == IDA_CANCELLED or bound == float("inf"):
+            break
+
+    # if we are here, no solution was found
+    result = SearchResult(board, generated, expanded, [], set(), None)
+    if monitor.stop_reason is not None:
+        mark_incomplete(result, monitor.stop_reason, best_board, best_path, layout)
+    return result
+
 
+@observed
+def parallel_ida_star(board: Board, **kwargs) -> SearchResult:
+    r"""
+    Parallel IDA*. The tree below the initial state is enumerated breadth-first
+    (without moving the blank straight back) until it has enough subtrees for
+    every worker. Each iteration then searches the subtrees on a process pool
+    with the same `f` bound, and as soon as one of them finds the goal the
+    others are cancelled. The next bound is the smallest `f` that exceeded the
+    bound in any subtree.
+
+    Args:
+        board: The board
+        workers (int): The number of worker processes. Default is the number of CPUs.
+        split_depth (int): The depth of the subtree roots. Default is the first
+            depth with at least ``workers *`` :data:`IDA_SPLIT_FACTOR` states.
+        depth_bound (int): A limit to search depth. Default is :math:`\infty`.
+        f_bound (float): A limit on state cost. Default is :math:`\infty`.
+        heuristic: A function that maps boards to an estimated cost-to-go.
+            Default is :func:`slidingpuzzle.heuristics.linear_conflict_distance`.
+        weight (float): A constant multiplier on heuristic evaluation
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. The workers share a count of
+            their expansions and stop once it reaches the budget, so it is
+            overshot by less than one check interval per worker. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
+
+    Returns:
+        A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics
+    """
+    # args
+    workers = kwargs.get("workers", None) or os.cpu_count()
+    depth_bound = kwargs.get("depth_bound", float("inf"))
+    f_bound = kwargs.get("f_bound", float("inf"))
+    heuristic = kwargs.get("heuristic", linear_conflict_distance)
+    weight = kwargs.get("weight", 1)
+
+    # initial state
+    layout = get_layout(*board.shape)
+    delta = get_heuristic_delta(heuristic, *board.shape)
+    initial_state = get_initial_state(board)
+    initial_state.h = heuristic(board)
+
+    # instrumentation
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+
+    # stats
+    generated, expanded = 0, 0
+
+    # subtree roots as (board, blank, h, prev, path), all at the same depth
+    roots = [(initial_state.board, initial_state.blank_pos, initial_state.h, -1, [])]
+    split_depth = kwargs.get("split_depth", None)
+    depth = 0
+    while (
+            (len(roots) < workers * IDA_SPLIT_FACTOR if split_depth is None else depth < split_depth)
+            and depth < depth_bound
+    ):
+        # the tree holds every path without immediate reversals, so the first
+        # level with the goal has a shortest solution
+        for current, _, _, _, path in roots:
+            if current == layout.goal:
+                solution = [layout.coords[move] for move in path]
+                return SearchResult(board, generated, expanded, [], set(), solution)
+        expanded += len(roots)
+        roots = [
+            child
+            for root in roots
+            for child in _split_children(root, layout, heuristic, delta)
+        ]
+        generated += len(roots)
+        depth += 1
+
+    best_h, best_board, best_path = initial_state.h, initial_state.board, []
+    bound = weight * initial_state.h
+    solution = None
+    # the workers count their expansions together, to stop at the node budget
+    context = multiprocessing.get_context()
+    cancel = context.Event()
+    counter = context.Value("q", expanded)
+    node_limit = getattr(monitor, "node_limit", None)
+    interval = min(IDA_CANCEL_INTERVAL, monitor.check_interval)
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_ida_worker,
+        initargs=(board.shape, heuristic, cancel, counter, node_limit, interval),
+    )
+    try:
+        while bound <= f_bound and solution is None and monitor.stop_reason is None:
+            # roots over the bound don't need a worker
+            next_bound = min(
+                (depth + weight * h for _, _, h, _, _ in roots if depth + weight * h > bound),
+                default=float("inf"),
+            )
+            active = [root for root in roots if depth + weight * root[2] <= bound]
+            chunksize = max(1, len(active) // (workers * IDA_SPLIT_FACTOR))
+            pending = {
+                executor.submit(
+                    _search_subtrees, active[i:i + chunksize], depth, bound, weight, depth_bound
+                )
+                for i in range(0, len(active), chunksize)
+            }
+            while pending:
+                done, pending = concurrent.futures.wait(
+                    pending, IDA_POLL_INTERVAL, concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    t, path, n_generated, n_expanded, best = future.result()
+                    generated += n_generated
+                    expanded += n_expanded
+                    if best[0] < best_h:
+                        best_h, best_board, best_path = best
+                    if t == IDA_FOUND and solution is None:
+                        solution = [layout.coords[move] for move in path]
+                    elif t >= 0:
+                        next_bound = min(next_bound, t)
+
+                # budget
+                if solution is None and monitor.update(generated, expanded, len(pending), 0, bound):
+                    cancel.set()
+                if solution is not None or monitor.stop_reason is not None:
+                    cancel.set()
+            cancel.clear()
+            if next_bound == float("inf"):
+                break
+            bound = next_bound
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+    result = SearchResult(board, generated, expanded, [], set(), solution)
+    if solution is None and monitor.stop_reason is not None:
+        mark_incomplete(result, monitor.stop_reason, best_board, best_path, layout)
+    return result
+
+
+def _split_children(
+        root: tuple, layout: Layout, heuristic: Heuristic, delta: Optional[HeuristicDelta]
+) -> list[tuple]:
+    # children of a subtree root, without moving the blank straight back
+    current, blank, h, prev, path = root
+    children = []
+    for move, shift, factor in layout.moves[blank]:
+        if move == prev:
+            continue
+        tile = (current >> shift) & layout.mask
+        next_board = current + tile * factor
+        if delta is not None:
+            next_h = h + delta(current, tile, move, blank)
+        else:
+            next_h = heuristic(unpack_board(next_board, layout.h, layout.w))
+        children.append((next_board, move, next_h, blank, path + [move]))
+    return children
+
+
+# the tables, cancellation event and shared expansion count of a
+# parallel_ida_star worker process
+_ida_worker: dict = {}
+
+
+def _init_ida_worker(
+        shape: tuple[int, int],
+        heuristic: Heuristic,
+        cancel,
+        counter,
+        node_limit: Optional[int],
+        interval: int,
+) -> None:
+    _init_worker({shape}, heuristic)
+    _ida_worker["layout"] = get_layout(*shape)
+    _ida_worker["heuristic"] = heuristic
+    _ida_worker["delta"] = get_heuristic_delta(heuristic, *shape)
+    _ida_worker["cancel"] = cancel
+    _ida_worker["counter"] = counter
+    _ida_worker["node_limit"] = node_limit
+    _ida_worker["interval"] = interval
+
+
+def _count_expansions(n: int) -> None:
+    # adds to the shared expansion count, cancelling every worker at the budget
+    node_limit, counter = _ida_worker["node_limit"], _ida_worker["counter"]
+    if node_limit is None:
+        return
+    with counter.get_lock():
+        counter.value += n
+        if counter.value >= node_limit:
+            _ida_worker["cancel"].set()
+
+
+def _search_subtrees(
+        roots: list[tuple], depth: int, bound: float, weight: float, depth_bound: float
+) -> tuple[int | float, list[int], int, int, tuple]:
+    # one bounded depth-first search per root, like ida_star's, returning the
+    # next bound (or IDA_FOUND and the moves), the stats and the closest state
+    layout, heuristic = _ida_worker["layout"], _ida_worker["heuristic"]
+    delta, cancel = _ida_worker["delta"], _ida_worker["cancel"]
+    interval = _ida_worker["interval"]
+    current, path = 0, []
+    generated, expanded = 0, 0
+    best = (float("inf"), 0, [])
+    next_bound = float("inf")
+
+    def bounded_dfs(blank: int, g: int, h: int | float, prev: int) -> int | float:
+        nonlocal current, generated, expanded, best
+        f = g + weight * h
+        if f > bound:
+            return f
+        expanded += 1
+
+        # goal check
+        if current == layout.goal:
+            cancel.set()
+            return IDA_FOUND
+
+        # cancelled by another worker or the budget
+        if not expanded % interval:
+            _count_expansions(interval)
+            if cancel.is_set():
+                return IDA_CANCELLED
+
+        # closest state so far, reported if the search is stopped
+        if h < best[0]:
+            best = (h, current, path.copy())
+
+        # bound
+        if g > depth_bound:
+            return float("inf")
+
+        # children
+        next_bound = float("inf")
+        for move, shift, factor in layout.moves[blank]:
+            # parent-move pruning
+            if move == prev:
+                continue
+            tile = (current >> shift) & layout.mask
+            if delta is not None:
+                next_h = h + delta(current, tile, move, blank)
+            current += tile * factor
+            if delta is None:
+                next_h = heuristic(unpack_board(current, layout.h, layout.w))
+            path.append(move)
+            generated += 1
+            t = bounded_dfs(move, g + 1, next_h, blank)
+            # found or cancelled
+            if t < 0:
+                return t
+            # undo
+            path.pop()
+            current -= tile * factor
+            next_bound = min(next_bound, t)
+        return next_bound
+
+    for current, blank, root_h, prev, root_path in roots:
+        if cancel.is_set():
+            next_bound = IDA_CANCELLED
+            break
+        path = root_path.copy()
+        t = bounded_dfs(blank, depth, root_h, prev)
+        if t < 0:
+            next_bound = t
+            break
+        next_bound = min(next_bound, t)
+    # the expansions since the last check
+    _count_expansions(expanded % interval)
+    return next_bound, path if next_bound == IDA_FOUND else [], generated, expanded, best
+
+
+@observed
+def bidirectional_bfs(board: Board, **kwargs) -> SearchResult:
+    r"""
+    Bidirectional breadth-first search. Expands a whole layer of either the
+    search from the board or the search from the goal (whichever frontier is
+    smaller) until the two meet, so each side only goes about half as deep.
+
+    Args:
+        board: The board
+        depth_bound (int): A limit to solution length. Default is :math:`\infty`.
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
+
+    Returns:
+        A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics
+    """
+    # args
+    depth_bound = kwargs.get("depth_bound", float("inf"))
+
+    # initial states
+    layout = get_layout(*board.shape)
+    initial_state = get_initial_state(board)
+    goal_state = get_goal_state(layout)
+    nodes = NodeTable(), NodeTable()
+    seen = {initial_state.board: initial_state}, {goal_state.board: goal_state}
+    unvisited = [initial_state], [goal_state]
+    depths = [0, 0]
+    meeting = (initial_state, goal_state) if initial_state.board == layout.goal else None
+
+    # instrumentation
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    expand = monitor.wrap("expansion", get_next_states)
+    check = monitor.check_interval
+
+    # with a budget, forward states are scored so the closest one can be reported
+    score = manhattan_distance if monitor.limited else None
+    scores = score, None
+    score_deltas = get_heuristic_delta(score, *board.shape) if score else None, None
+    initial_state.h = score(board) if score else 0
+    best = initial_state
+
+    # stats
+    generated, expanded = 0, 0
+
+    while (
+            meeting is None
+            and monitor.stop_reason is None
+            and all(unvisited)
+            and sum(depths) < depth_bound
+    ):
+        side = 0 if len(unvisited[0]) <= len(unvisited[1]) else 1
+        visited, other = seen[side], seen[1 - side]
+        frontier = []
+        for state in unvisited[side]:
+            expanded += 1
+
+            # budget
+            if not expanded % check and monitor.update(
+                    generated, expanded, sum(map(len, unvisited)) + len(frontier),
+                    len(seen[0]) + len(seen[1]), sum(depths), len(nodes[0]) + len(nodes[1]),
+            ):
+                break
+
+            # closest state so far, reported if the search is stopped
+            if side == 0 and state.h < best.h:
+                best = state
+
+            next_states = expand(state, layout, nodes[side], scores[side], score_deltas[side])
+            generated += len(next_states)
+            for next_state in next_states:
+                # duplicate detection
+                if next_state.board in visited:
+                    continue
+                visited[next_state.board] = next_state
+                frontier.append(next_state)
+                # the whole layer has the same depth, so keep the shallowest match
+                match = other.get(next_state.board, None)
+                if match is None:
+                    continue
+                if meeting is None or match.depth < meeting[1 - side].depth:
+                    meeting = (next_state, match) if side == 0 else (match, next_state)
+        unvisited[side][:] = frontier
+        depths[side] += 1
+
+    visited = seen[0].keys() | seen[1].keys()
+    unvisited = unvisited[0] + unvisited[1]
+    if meeting is None:
+        result = SearchResult(board, generated, expanded, unvisited, visited, None)
+        if monitor.stop_reason is not None:
+            moves = nodes[0].path(best.node)
+            mark_incomplete(result, monitor.stop_reason, best.board, moves, layout)
+        return result
+    solution = join_solution(*meeting, layout, nodes)
+    return SearchResult(board, generated, expanded, unvisited, visited, solution)
+
+
+@observed
+def bidirectional_a_star(board: Board, **kwargs) -> SearchResult:
+    r"""
+    Bidirectional A*. Runs an A* search from the board towards the goal and one
+    from the goal towards the board, expanding from the smaller open list, and
+    stops once no path through either open list can beat the best meeting found.
+    The backward search uses :func:`euristicas.get_target_heuristic`.
+
+    Args:
+        board: The board
+        depth_bound (int): A limit to solution length. Default is :math:`\infty`.
+        heuristic: A function that maps boards to an estimated cost-to-go.
+            Default is :func:`slidingpuzzle.heuristics.linear_conflict_distance`.
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+        time_limit (float): Wall-clock budget in seconds. Default is ``None``.
+        node_limit (int): Budget on expanded states. Default is ``None``.
+        memory_limit (int): Budget in bytes on the estimated search memory.
+            Default is ``None``.
+
+    Returns:
+        A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics
+    """
+    # args
+    depth_bound = kwargs.get("depth_bound", float("inf"))
+    heuristic = kwargs.get("heuristic", linear_conflict_distance)
+
+    # initial states
+    layout = get_layout(*board.shape)
+    backward_heuristic, backward_delta = get_target_heuristic(heuristic, board)
+    heuristics = heuristic, backward_heuristic
+    deltas = get_heuristic_delta(heuristic, *board.shape), backward_delta
+
+    # instrumentation
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    expand = monitor.wrap("expansion", get_next_states)
+    push, pop = monitor.wrap("heap", heapq.heappush), monitor.wrap("heap", heapq.heappop)
+    heuristics = tuple(monitor.wrap("heuristic", fn) for fn in heuristics)
+    deltas = tuple(monitor.wrap("heuristic", fn) for fn in deltas)
+    check = monitor.check_interval
+
+    initial_state = get_initial_state(board)
+    initial_state.h = initial_state.f = heuristics[0](board)
+    goal_state = get_goal_state(layout)
+    goal_state.h = goal_state.f = heuristics[1](new_board(*board.shape))
+    nodes = NodeTable(), NodeTable()
+    seen = {initial_state.board: initial_state}, {goal_state.board: goal_state}
+    unvisited = [initial_state], [goal_state]
+    best, meeting = float("inf"), None
+    if initial_state.board == layout.goal:
+        best, meeting = 0, (initial_state, goal_state)
+    closest = initial_state
+
+    # stats
+    generated, expanded = 0, 0
+
+    while all(unvisited):
+        # no path through either frontier can be shorter
+        if best <= max(unvisited[0][0].f, unvisited[1][0].f):
+            break
+
+        side = 0 if len(unvisited[0]) <= len(unvisited[1]) else 1
+        visited, other = seen[side], seen[1 - side]
+        state = pop(unvisited[side])
+
+        # duplicate detection (a shorter path to this board was found later)
+        if visited[state.board] is not state:
+            continue
+        expanded += 1
+
+        # budget
+        if not expanded % check and monitor.update(
+                generated, expanded, len(unvisited[0]) + len(unvisited[1]),
+                len(seen[0]) + len(seen[1]), state.f, len(nodes[0]) + len(nodes[1]),
+        ):
+            break
+
+        # closest state so far, reported if the search is stopped
+        if side == 0 and state.h < closest.h:
+            closest = state
+
+        # bound
+        if state.f > depth_bound:
+            continue
+
+        # children
+        next_states = expand(
+            state, layout, nodes[side], heuristics[side], deltas[side]
+        )
+        generated += len(next_states)
+        for next_state in next_states:
+            known = visited.get(next_state.board, None)
+            if known is not None and known.depth <= next_state.depth:
+                continue
+            visited[next_state.board] = next_state
+            next_state.g = next_state.depth
+            next_state.f = next_state.g + next_state.h
+            push(unvisited[side], next_state)
+            match = other.get(next_state.board, None)
+            if match is not None and next_state.depth + match.depth < best:
+                best = next_state.depth + match.depth
+                meeting = (next_state, match) if side == 0 else (match, next_state)
+
+    visited = seen[0].keys() | seen[1].keys()
+    unvisited = unvisited[0] + unvisited[1]
+    if meeting is None:
+        result = SearchResult(board, generated, expanded, unvisited, visited, None)
+        if monitor.stop_reason is not None:
+            moves = nodes[0].path(closest.node)
+            mark_incomplete(result, monitor.stop_reason, closest.board, moves, layout)
+        return result
+    solution = join_solution(*meeting, layout, nodes)
+    return SearchResult(board, generated, expanded, unvisited, visited, solution)
+
+
+@observed
+def table_lookup(board: Board, **kwargs) -> SearchResult:
+    r"""
+    Reads an optimal solution from the precomputed table of every state (see
+    :mod:`solution_table`), which only exists for boards of up to 9 tiles. The
+    table is built and saved on first use, then memory-mapped.
+
+    Args:
+        board: The board
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+
+    Returns:
+        A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics
+    """
+    layout = get_layout(*board.shape)
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    moves, expanded = monitor.wrap("expansion", lookup_solution)(board)
+    solution = [layout.coords[move] for move in moves]
+    return SearchResult(board, 0, expanded, [], set(), solution)
+
+
+@observed
+def constructive(board: Board, **kwargs) -> SearchResult:
+    r"""
+    Builds a solution row by row and column by column, finishing the last block
+    of at most 3x3 tiles with the solution table (see :mod:`constructive`). The
+    solution is usually much longer than optimal, but any board size is solved
+    in milliseconds.
+
+    Args:
+        board: The board
+        shorten (bool): Cut the parts of the solution that return to an earlier
+            board. Default is ``True``.
+        observer: A :class:`monitor.SearchObserver` (or a function) that receives
+            periodic progress reports. Default is ``None``.
+        progress_interval (float): Seconds between progress reports. Default is ``1.0``.
+
+    Returns:
+        A :class:`slidingpuzzle.state.SearchResult` with a solution and statistics
+    """
+    layout = get_layout(*board.shape)
+    monitor = kwargs.get("monitor", NULL_MONITOR)
+    shorten = kwargs.get("shorten", True)
+    moves, expanded = monitor.wrap("expansion", solve_constructive)(board, shorten)
+    solution = [layout.coords[move] for move in moves]
+    return SearchResult(board, 0, expanded, [], set(), solution)
+
+
+# algorithms that take a heuristic
+HEURISTIC_ALGORITHMS = (
+    Algorithm.A_ESTRELA,
+    Algorithm.A_ESTRELA_PARALELO,
+    Algorithm.BUSCA_GULOSA,
+    Algorithm.DIJKSTRA,
+    Algorithm.IDA_STAR,
+    Algorithm.IDA_STAR_PARALELO,
+    Algorithm.A_ESTRELA_BIDIRECIONAL,
+)
 
 ALGORITHMS_MAP = {
     Algorithm.A_ESTRELA: a_star,
+    Algorithm.A_ESTRELA_PARALELO: parallel_a_star,
     Algorithm.BUSCA_LARGURA: bfs,
+    Algorithm.BUSCA_LARGURA_VETORIZADA: vectorized_bfs,
+    Algorithm.BUSCA_LARGURA_EXTERNA: external_bfs,
     Algorithm.BUSCA_PROFUNDIDADE: dfs,
     Algorithm.BUSCA_GULOSA: greedy,
     Algorithm.DIJKSTRA: dijkistra,
-
+    Algorithm.IDA_STAR: ida_star,
+    Algorithm.IDA_STAR_PARALELO: parallel_ida_star,
+    Algorithm.BUSCA_BIDIRECIONAL: bidirectional_bfs,
+    Algorithm.A_ESTRELA_BIDIRECIONAL: bidirectional_a_star,
+    Algorithm.TABLE_LOOKUP: table_lookup,
+    Algorithm.CONSTRUTIVO: constructive,
 }
 
 
 def search(board: Board, alg: Algorithm | str = Algorithm.A_ESTRELA, **kwargs) -> SearchResult:
-    print("Iniciando Busca...")
-
-
+    r"""
+    Solves a board with the given algorithm. Pass a :class:`solution_cache.SolutionCache`
+    as ``cache`` to reuse the solutions of boards seen before, and ``optimize=True``
+    to shorten the solution afterwards (see :func:`path_optimizer.optimize_solution`),
+    which is worth it for the suboptimal searches. The other ``kwargs`` are passed
+    on to the search.
+    """
+    log.info("Iniciando Busca...")
 
     alg = Algorithm(alg)
 
-    print(f"Algorithm {alg}")
+    log.info(f"Algorithm {alg}")
 
-    if alg == Algorithm.BUSCA_GULOSA or alg == Algorithm.A_ESTRELA:
-        heuristic = kwargs.get("heuristic", manhattan_distance)
-        print(f"Heuristic:  {heuristic.__name__}")
+    if alg in HEURISTIC_ALGORITHMS:
+        heuristic = kwargs.get("heuristic", linear_conflict_distance)
+        log.info(f"Heuristic:  {heuristic.__name__}")
 
     if not is_solvable(board):
         raise ValueError(f"The provided board is not solvable:\n{board}")
-    return ALGORITHMS_MAP[alg](board, **kwargs)
\ No newline at end of file
+
+    # solutions of repeated (or transposed) boards are read from the cache
+    cache = kwargs.pop("cache", None)
+    if cache is None:
+        return run_search(board, alg, kwargs)
+    namespace = get_cache_namespace(alg, kwargs)
+    solution = cache.get(board, namespace)
+    if solution is not None:
+        return SearchResult(board, 0, 0, [], set(), solution)
+    result = run_search(board, alg, kwargs)
+    if result.solution is not None:
+        cache.put(board, result.solution, namespace)
+    return result
+
+
+def run_search(board: Board, alg: Algorithm, kwargs: dict) -> SearchResult:
+    r"""
+    Runs a search, then shortens its solution if ``kwargs`` has ``optimize=True``.
+    """
+    kwargs = dict(kwargs)
+    optimize = kwargs.pop("optimize", False)
+    result = ALGORITHMS_MAP[alg](board, **kwargs)
+    if optimize and result.solution:
+        result.solution = optimize_solution(board, result.solution)
+    return result
+
+
+def get_cache_namespace(alg: Algorithm, kwargs: dict) -> str:
+    r"""
+    The :class:`solution_cache.SolutionCache` namespace of a search, so that
+    solutions are only shared between searches that would find equally good ones.
+    """
+    namespace = alg.value
+    if alg in HEURISTIC_ALGORITHMS:
+        namespace += f":{kwargs.get('heuristic', linear_conflict_distance).__name__}"
+    weight = kwargs.get("weight", 1)
+    if weight != 1:
+        namespace += f":w{weight}"
+    if not kwargs.get("shorten", True):
+        namespace += ":unshortened"
+    if kwargs.get("optimize", False):
+        namespace += ":optimized"
+    return namespace
+
+
+def search_many(
+        boards: Iterable[Board],
+        alg: Algorithm | str = Algorithm.A_ESTRELA,
+        workers: Optional[int] = None,
+        chunksize: int = 1,
+        ordered: bool = True,
+        summary: bool = False,
+        **kwargs,
+) -> Iterator[SearchResult | SearchSummary]:
+    r"""
+    Solves many boards in parallel on a pool of worker processes.
+
+    Args:
+        boards: The boards to solve.
+        alg: The search algorithm.
+        workers: The number of worker processes. Default is the number of CPUs.
+        chunksize: The number of boards sent to a worker at a time.
+        ordered: If ``True``, results are yielded in the order of ``boards``,
+            otherwise as soon as they are ready.
+        summary: If ``True``, yield a :class:`SearchSummary` for each board instead
+            of the full :class:`SearchResult`, so the frontier and visited states
+            don't have to be sent back from the workers.
+        kwargs: Passed on to the search algorithm, except ``optimize`` (see :func:`search`).
+
+    Returns:
+        An iterator over the results.
+    """
+    alg = Algorithm(alg)
+    boards = list(boards)
+    for board in boards:
+        if not is_solvable(board):
+            raise ValueError(f"The provided board is not solvable:\n{board}")
+    shapes = {board.shape for board in boards}
+    chunks = [boards[i:i + chunksize] for i in range(0, len(boards), chunksize)]
+    _prepare_shared_tables(shapes, alg, kwargs.get("heuristic", linear_conflict_distance))
+
+    executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=_init_worker,
+        initargs=(shapes, kwargs.get("heuristic", linear_conflict_distance)),
+    )
+    try:
+        futures = [
+            executor.submit(_solve_chunk, chunk, alg, summary, kwargs)
+            for chunk in chunks
+        ]
+        if not ordered:
+            futures = concurrent.futures.as_completed(futures)
+        for future in futures:
+            yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _prepare_shared_tables(shapes: set[tuple[int, int]], alg: Algorithm, heuristic: Heuristic) -> None:
+    # builds the tables saved to disk before a pool starts, so that its workers
+    # only memory-map them instead of all building the same table at once
+    for h, w in shapes:
+        if heuristic is pattern_database_distance:
+            get_pattern_databases(h, w)
+        if alg == Algorithm.TABLE_LOOKUP and h * w <= MAX_TABLE_CELLS:
+            get_solution_table(h, w)
+        elif alg == Algorithm.CONSTRUTIVO:
+            get_solution_table(min(h, BLOCK_SIZE), min(w, BLOCK_SIZE))
+
+
+def _init_worker(shapes: set[tuple[int, int]], heuristic: Heuristic) -> None:
+    # build the per-shape tables once per worker, instead of in the first search
+    for h, w in shapes:
+        get_layout(h, w)
+        heuristic(new_board(h, w))
+        get_heuristic_delta(heuristic, h, w)
+
+
+def _solve_chunk(
+        boards: list[Board], alg: Algorithm, summary: bool, kwargs: dict
+) -> list[SearchResult | SearchSummary]:
+    results = []
+    for board in boards:
+        result = run_search(board, alg, kwargs)
+        results.append(result.summary() if summary else result)
+    return results
@@ -0,0 +1,428 @@
+import argparse
+import csv
+import dataclasses
+import json
+import logging
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Iterable, Optional
+
+from algoritmos import *
+from generator import depth_band_boards, random_boards, random_walk_boards
+
+log = logging.getLogger(__name__)
+
+FIELDS = [
+    "instance",
+    "shape",
+    "algorithm",
+    "heuristic",
+    "solved",
+    "solution_len",
+    "generated",
+    "expanded",
+    "seconds",
+    "generated_per_second",
+    "expanded_per_second",
+    "peak_memory",
+]
+
+
+@dataclasses.dataclass
+class Instance:
+    """
+    Args:
+        name: A stable identifier of the instance within its set.
+        board: The board to solve.
+    """
+    name: str
+    board: Board
+
+
+@dataclasses.dataclass
+class BenchmarkRecord:
+    """
+    Args:
+        instance: The name of the instance.
+        shape: The board shape, as ``"HxW"``.
+        algorithm: The :class:`algoritmos.Algorithm` value.
+        heuristic: The :class:`euristicas.Heuristics` name, or ``None``.
+        solved: Whether a solution was found.
+        solution_len: The number of moves in the solution.
+        generated: The number of states generated.
+        expanded: The number of states expanded.
+        seconds: Wall-clock time of the search.
+        generated_per_second: Generation throughput.
+        expanded_per_second: Expansion throughput.
+        peak_memory: Peak bytes allocated by Python during the search (only
+            measured with ``--memory``, in a separate run).
+    """
+    instance: str
+    shape: str
+    algorithm: str
+    heuristic: Optional[str]
+    solved: bool
+    solution_len: Optional[int]
+    generated: int
+    expanded: int
+    seconds: float
+    generated_per_second: float
+    expanded_per_second: float
+    peak_memory: Optional[int] = None
+
+
+def random_board(h: int, w: int, rng: random.Random) -> Board:
+    r"""
+    A uniformly random solvable board, drawn from ``rng``.
+    """
+    return shuffle(new_board(h, w), rng)
+
+
+def random_instances(h: int, w: int, count: int, seed: int) -> list[Instance]:
+    r"""
+    Uniformly random solvable boards (see :func:`generator.random_boards`).
+    """
+    boards = np.concatenate(list(random_boards(h, w, count, seed)))
+    return [Instance(f"random-{h}x{w}-{seed}-{i}", board) for i, board in enumerate(boards)]
+
+
+def walk_instances(h: int, w: int, count: int, length: int, seed: int) -> list[Instance]:
+    r"""
+    The boards reached by random walks of ``length`` moves from the goal (see
+    :func:`generator.random_walk_boards`).
+    """
+    boards = np.concatenate(list(random_walk_boards(h, w, count, length, seed)))
+    return [
+        Instance(f"walk{length}-{h}x{w}-{seed}-{i}", board)
+        for i, board in enumerate(boards)
+    ]
+
+
+def depth_instances(depths: Iterable[int], count: int, seed: int) -> list[Instance]:
+    r"""
+    Random 3x3 boards with the given optimal solution lengths, ``count`` of each
+    (see :func:`generator.depth_band_boards`).
+    """
+    depths = sorted(set(depths))
+    # every depth gets its own seed, drawn from the set's
+    seeds = np.random.default_rng(seed).integers(1 << 63, size=len(depths)).tolist()
+    return [
+        Instance(f"depth{depth}-3x3-{seed}-{i}", board)
+        for depth, depth_seed in zip(depths, seeds)
+        for i, board in enumerate(
+            np.concatenate(list(depth_band_boards(3, 3, count, depth, depth, seed=depth_seed)))
+        )
+    ]
+
+
+def band_instances(h: int, w: int, count: int, band: tuple[int, int], seed: int) -> list[Instance]:
+    r"""
+    Random boards with an optimal solution length in ``band`` (see
+    :func:`generator.depth_band_boards`).
+    """
+    boards = np.concatenate(list(depth_band_boards(h, w, count, *band, seed=seed)))
+    return [
+        Instance(f"band{band[0]}-{band[1]}-{h}x{w}-{seed}-{i}", board)
+        for i, board in enumerate(boards)
+    ]
+
+
+def load_instances(path: str, h: int, w: int, korf: bool = False) -> list[Instance]:
+    r"""
+    Reads boards from a text file with one board per line, as whitespace separated
+    tiles in row-major order (blank is 0). Blank lines and ``#`` comments are skipped.
+
+    Args:
+        path: The file to read.
+        h: The board height.
+        w: The board width.
+        korf: Read lines in the format of Korf's 100 15-puzzle instances, i.e. an
+            instance number followed by tiles solved with the blank in the top-left
+            corner. Boards are rotated by 180 degrees and relabeled to this repo's
+            goal, which keeps every optimal solution length the same.
+
+    Returns:
+        The instances, named after the file and line.
+    """
+    instances = []
+    with open(path) as file:
+        for i, line in enumerate(file):
+            line = line.split("#")[0].split()
+            if not line:
+                continue
+            name = f"{path}:{i + 1}"
+            if korf:
+                name, line = line[0], line[1:]
+            tiles = [int(tile) for tile in line]
+            if korf:
+                tiles = [BLANK if tile == BLANK else h * w - tile for tile in reversed(tiles)]
+            instances.append(Instance(name, np.array(tiles).reshape(h, w)))
+    return instances
+
+
+def run_one(
+        instance: Instance,
+        alg: Algorithm,
+        heuristic: Optional[Heuristics],
+        memory: bool = False,
+        **kwargs,
+) -> BenchmarkRecord:
+    r"""
+    Solves one instance and records its statistics.
+    """
+    if heuristic is not None:
+        kwargs["heuristic"] = HEURISTICS_MAP[heuristic]
+    search_fn = ALGORITHMS_MAP[alg]
+    start = time.perf_counter()
+    result = search_fn(instance.board, **kwargs)
+    seconds = time.perf_counter() - start
+
+    peak_memory = None
+    if memory:
+        # tracing slows the search down, so it gets a run of its own
+        tracemalloc.start()
+        search_fn(instance.board, **kwargs)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    h, w = instance.board.shape
+    return BenchmarkRecord(
+        instance=instance.name,
+        shape=f"{h}x{w}",
+        algorithm=alg.value,
+        heuristic=heuristic.name if heuristic is not None else None,
+        solved=result.solution is not None,
+        solution_len=len(result.solution) if result.solution is not None else None,
+        generated=result.generated,
+        expanded=result.expanded,
+        seconds=seconds,
+        generated_per_second=result.generated / seconds if seconds else 0.0,
+        expanded_per_second=result.expanded / seconds if seconds else 0.0,
+        peak_memory=peak_memory,
+    )
+
+
+def run(
+        instances: list[Instance],
+        algorithms: Iterable[Algorithm],
+        heuristics: Iterable[Heuristics],
+        memory: bool = False,
+        **kwargs,
+) -> list[BenchmarkRecord]:
+    r"""
+    Runs every algorithm (with every heuristic, for algorithms that take one)
+    over every instance. Combinations that can't handle an instance, e.g. table
+    lookups of large boards, are skipped.
+    """
+    records = []
+    heuristics = list(heuristics)
+    for alg in algorithms:
+        for heuristic in heuristics if alg in HEURISTIC_ALGORITHMS else [None]:
+            for instance in instances:
+                try:
+                    record = run_one(instance, alg, heuristic, memory, **kwargs)
+                except ValueError as e:
+                    log.warning(f"Skipping {alg.value} on {instance.name}: {e}")
+                    continue
+                records.append(record)
+    return records
+
+
+def summarize(records: list[BenchmarkRecord]) -> list[dict]:
+    r"""
+    Aggregates records per (shape, algorithm, heuristic).
+    """
+    groups: dict[tuple, list[BenchmarkRecord]] = {}
+    for record in records:
+        groups.setdefault((record.shape, record.algorithm, record.heuristic), []).append(record)
+    summary = []
+    for (shape, algorithm, heuristic), group in groups.items():
+        seconds = sum(record.seconds for record in group)
+        solved = [record for record in group if record.solved]
+        summary.append({
+            "shape": shape,
+            "algorithm": algorithm,
+            "heuristic": heuristic,
+            "instances": len(group),
+            "solved": len(solved),
+            "mean_solution_len": (
+                sum(record.solution_len for record in solved) / len(solved) if solved else None
+            ),
+            "mean_expanded": sum(record.expanded for record in group) / len(group),
+            "seconds": seconds,
+            "expanded_per_second": (
+                sum(record.expanded for record in group) / seconds if seconds else 0.0
+            ),
+            "max_peak_memory": max(
+                (record.peak_memory for record in group if record.peak_memory is not None),
+                default=None,
+            ),
+        })
+    return summary
+
+
+def get_metadata() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def write_records(records: list[BenchmarkRecord], file, fmt: str, args: dict) -> None:
+    if fmt == "csv":
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow(dataclasses.asdict(record))
+    else:
+        json.dump(
+            {
+                "metadata": get_metadata() | {"args": args},
+                "records": [dataclasses.asdict(record) for record in records],
+                "summary": summarize(records),
+            },
+            file,
+            indent=2,
+        )
+
+
+def read_records(path: str) -> list[BenchmarkRecord]:
+    if path.endswith(".csv"):
+        records = []
+        with open(path, newline="") as file:
+            for row in csv.DictReader(file):
+                records.append(BenchmarkRecord(
+                    instance=row["instance"],
+                    shape=row["shape"],
+                    algorithm=row["algorithm"],
+                    heuristic=row["heuristic"] or None,
+                    solved=row["solved"] == "True",
+                    solution_len=int(row["solution_len"]) if row["solution_len"] else None,
+                    generated=int(row["generated"]),
+                    expanded=int(row["expanded"]),
+                    seconds=float(row["seconds"]),
+                    generated_per_second=float(row["generated_per_second"]),
+                    expanded_per_second=float(row["expanded_per_second"]),
+                    peak_memory=int(row["peak_memory"]) if row["peak_memory"] else None,
+                ))
+        return records
+    with open(path) as file:
+        return [BenchmarkRecord(**record) for record in json.load(file)["records"]]
+
+
+def compare(old: list[BenchmarkRecord], new: list[BenchmarkRecord], file=sys.stdout) -> None:
+    r"""
+    Prints the change in time, expansions and solution length for every
+    (shape, algorithm, heuristic) present in both runs.
+    """
+    before = {
+        (row["shape"], row["algorithm"], row["heuristic"]): row for row in summarize(old)
+    }
+    for row in summarize(new):
+        key = (row["shape"], row["algorithm"], row["heuristic"])
+        if key not in before:
+            continue
+        old_row = before[key]
+        speedup = old_row["seconds"] / row["seconds"] if row["seconds"] else float("inf")
+        print(
+            f"{key[0]} {key[1]:<18} {str(key[2]):<18} "
+            f"time x{speedup:.2f} faster, "
+            f"expanded {old_row['mean_expanded']:.0f} -> {row['mean_expanded']:.0f}, "
+            f"solution {old_row['mean_solution_len']} -> {row['mean_solution_len']}",
+            file=file,
+        )
+
+
+def get_instances(args: argparse.Namespace) -> list[Instance]:
+    h, w = args.shape
+    if args.set == "depth":
+        return depth_instances(args.depths, args.count, args.seed)
+    if args.set == "walk":
+        return walk_instances(h, w, args.count, args.walk_length, args.seed)
+    if args.set == "band":
+        return band_instances(h, w, args.count, args.band, args.seed)
+    if args.set == "file":
+        return load_instances(args.instances, h, w, args.korf)
+    return random_instances(h, w, args.count, args.seed)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the search algorithms and heuristics.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run a benchmark")
+    run_parser.add_argument(
+        "--set", choices=["depth", "band", "random", "walk", "file"], default="depth",
+        help="instance set: 3x3 boards by optimal depth, boards in an optimal depth --band, "
+             "uniformly random boards, random walks from the goal, or boards read from --instances",
+    )
+    run_parser.add_argument("--shape", type=lambda s: tuple(int(i) for i in s.split("x")), default=(3, 3))
+    run_parser.add_argument("--count", type=int, default=5, help="instances (per depth)")
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--depths", type=lambda s: [int(i) for i in s.split(",")], default=[10, 16, 22, 28])
+    run_parser.add_argument("--walk-length", type=int, default=40)
+    run_parser.add_argument(
+        "--band", type=lambda s: tuple(int(i) for i in s.split(",")), default=(20, 24),
+        help="MIN,MAX optimal solution lengths of --set band (boards up to 3x3)",
+    )
+    run_parser.add_argument("--instances", help="file of boards, one per line")
+    run_parser.add_argument("--korf", action="store_true", help="--instances uses Korf's format")
+    run_parser.add_argument(
+        "--algorithms", type=lambda s: [Algorithm(a) for a in s.split(",")],
+        default=list(Algorithm), help="comma separated Algorithm values",
+    )
+    run_parser.add_argument(
+        "--heuristics", type=lambda s: [Heuristics[name] for name in s.split(",")],
+        default=list(Heuristics), help="comma separated Heuristics names",
+    )
+    run_parser.add_argument("--memory", action="store_true", help="also measure peak memory")
+    run_parser.add_argument("--format", choices=["json", "csv"], default="json")
+    run_parser.add_argument("--output", help="file to write results to (default: stdout)")
+
+    compare_parser = commands.add_parser("compare", help="compare two benchmark results")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.command == "compare":
+        compare(read_records(args.old), read_records(args.new))
+        return
+
+    records = run(get_instances(args), args.algorithms, args.heuristics, args.memory)
+    settings = {
+        key: value for key, value in vars(args).items()
+        if key not in ("algorithms", "heuristics")
+    } | {
+        "algorithms": [alg.value for alg in args.algorithms],
+        "heuristics": [heuristic.name for heuristic in args.heuristics],
+    }
+    if args.output:
+        with open(args.output, "w", newline="") as file:
+            write_records(records, file, args.format, settings)
+    else:
+        write_records(records, sys.stdout, args.format, settings)
+    for row in summarize(records):
+        print(
+            f"{row['shape']} {row['algorithm']:<18} {str(row['heuristic']):<18} "
+            f"solved {row['solved']}/{row['instances']} in {row['seconds']:.3f}s, "
+            f"{row['expanded_per_second']:.0f} expanded/s",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
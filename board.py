@@ -1,3 +1,5 @@
+import dataclasses
+import functools
 import itertools
 import random
 import sys
@@ -10,6 +12,7 @@ grid_size = 4
 BLANK = 0
 Board: TypeAlias = npt.NDArray
 FrozenBoard: TypeAlias = tuple[tuple[int, ...], ...]
+PackedBoard: TypeAlias = int
 
 
 def new_board(h: int, w: int) -> Board:
@@ -22,6 +25,109 @@ def copy_board(board: Board) -> FrozenBoard:
     return tuple(tuple(int(col) for col in row) for row in board)
 
 
+@dataclasses.dataclass(frozen=True)
+class Layout:
+    """
+    Precomputed tables for working with packed boards of a given shape.
+
+    A packed board stores tile ``i`` (in row-major order) in bits
+    ``[i * bits, (i + 1) * bits)`` of a single int, and positions are flat
+    indices ``y * w + x``.
+
+    Args:
+        h: The board height.
+        w: The board width.
+        bits: The number of bits used to store each tile.
+        mask: A mask selecting the lowest ``bits`` bits.
+        goal: The packed solved board.
+        coords: Maps a flat index to its (y, x)-coord.
+        moves: Maps a blank index to a tuple of ``(move, shift, factor)`` entries,
+            one per valid move and in the same order as :func:`get_valid_moves`.
+            The moved tile is ``(packed >> shift) & mask`` and the resulting
+            board is ``packed + tile * factor``.
+    """
+
+    h: int
+    w: int
+    bits: int
+    mask: int
+    goal: PackedBoard
+    coords: tuple[tuple[int, int], ...]
+    moves: tuple[tuple[tuple[int, int, int], ...], ...]
+
+
+@functools.cache
+def get_layout(h: int, w: int) -> Layout:
+    r"""
+    Builds (once per shape) the tables used to pack boards and generate moves.
+
+    Args:
+        h: The board height.
+        w: The board width.
+
+    Returns:
+        The :class:`Layout` for boards of shape ``(h, w)``.
+    """
+    bits = max(1, (h * w - 1).bit_length())
+    coords = tuple((i // w, i % w) for i in range(h * w))
+    moves = []
+    for blank in range(h * w):
+        entries = []
+        for y, x in get_valid_moves(new_board(h, w), coords[blank]):
+            move = y * w + x
+            factor = (1 << (blank * bits)) - (1 << (move * bits))
+            entries.append((move, move * bits, factor))
+        moves.append(tuple(entries))
+    goal = pack_board(new_board(h, w))
+    return Layout(h, w, bits, (1 << bits) - 1, goal, coords, tuple(moves))
+
+
+def pack_board(board: Board | FrozenBoard) -> PackedBoard:
+    r"""
+    Encodes a board as a single int, using the tile width of :func:`get_layout`.
+
+    Args:
+        board: The board to pack.
+
+    Returns:
+        The packed board.
+    """
+    h, w = len(board), len(board[0])
+    bits = max(1, (h * w - 1).bit_length())
+    packed = 0
+    for i, tile in enumerate(itertools.chain.from_iterable(board)):
+        packed |= int(tile) << (i * bits)
+    return packed
+
+
+def unpack_board(packed: PackedBoard, h: int, w: int) -> Board:
+    r"""
+    Decodes a board previously encoded with :func:`pack_board`.
+
+    Args:
+        packed: The packed board.
+        h: The board height.
+        w: The board width.
+
+    Returns:
+        A new board.
+    """
+    bits = max(1, (h * w - 1).bit_length())
+    mask = (1 << bits) - 1
+    tiles = [(packed >> (i * bits)) & mask for i in range(h * w)]
+    return np.array(tiles).reshape(h, w)
+
+
+def find_packed_blank(packed: PackedBoard, layout: Layout) -> int:
+    r"""
+    Finds the flat index of the blank on a packed board.
+    """
+    for i in range(layout.h * layout.w):
+        if (packed >> (i * layout.bits)) & layout.mask == BLANK:
+            return i
+    raise ValueError("There is no blank on the board.")
+
+
 def print_board(board: Board, file=sys.stdout) -> None:
     board_size = len(board) * len(board[0])
     # the longest str we need to print is the largest tile number
@@ -103,30 +209,56 @@ def swap_tiles(
 
 
 def count_inversions(board: Board) -> int:
-    _, w = board.shape
-    board_size = np.prod(board.shape)
+    r"""
+    Counts the pairs of tiles (ignoring the blank) that are out of order in
+    row-major order, in :math:`O(n \log n)` with a Fenwick tree.
+    """
+    tiles = [tile for tile in np.ravel(board).tolist() if tile != BLANK]
+    # tree[k] counts the tiles seen so far in a range of values ending at k
+    tree = [0] * (len(tiles) + 2)
     inversions = 0
-    for i in range(board_size):
-        t1 = board[i // w, i % w]
-        if t1 == BLANK:
-            continue
-        for j in range(i + 1, board_size):
-            t2 = board[j // w, j % w]
-            if t2 == BLANK:
-                continue
-            if t2 < t1:
-                inversions += 1
+    for i, tile in enumerate(tiles):
+        k = tile
+        while k > 0:
+            inversions -= tree[k]
+            k -= k & -k
+        # the tiles seen so far, minus those smaller than this one
+        inversions += i
+        k = tile
+        while k < len(tree):
+            tree[k] += 1
+            k += k & -k
     return inversions
 
 
+def permutation_parity(tiles: list[int]) -> int:
+    r"""
+    The parity of the inversions of a permutation of ``1..len(tiles)``, in
+    :math:`O(n)`: a permutation with ``c`` cycles is ``n - c`` swaps away from
+    being sorted.
+    """
+    seen = [False] * len(tiles)
+    swaps = 0
+    for start in range(len(tiles)):
+        if seen[start]:
+            continue
+        i = start
+        while not seen[i]:
+            seen[i] = True
+            i = tiles[i] - 1
+            swaps += 1
+        swaps -= 1
+    return swaps % 2
+
+
 def is_solvable(board: Board) -> bool:
     r"""
     Determines if it is possible to solve this board.
 
     Note:
-        The algorithm counts `inversions`_ to determine solvability.
-        The "standard" algorithm has been modified here to support
-        non-square board sizes.
+        The algorithm uses the parity of the `inversions`_ to determine
+        solvability. The "standard" algorithm has been modified here to
+        support non-square board sizes.
 
     Args:
         board: The puzzle board.
@@ -134,49 +266,95 @@ def is_solvable(board: Board) -> bool:
     Returns:
         bool: True if the board is solvable, False otherwise.
     """
-    inversions = count_inversions(board)
     h, w = board.shape
+    tiles = np.ravel(board).tolist()
+    blank = tiles.index(BLANK)
+    parity = permutation_parity([tile for tile in tiles if tile != BLANK])
     if w % 2 == 0:
-        y, _ = find_blank(board)
-        if h % 2 == 0:
-            if (inversions + y) % 2 != 0:
-                return True
-        else:
-            if (inversions + y) % 2 == 0:
-                return True
-    elif inversions % 2 == 0:
-        return True
+        # the blank's row changes the parity on boards of even width
+        return (parity + blank // w) % 2 == (h + 1) % 2
+    return parity == 0
+
+
+def count_inversions_many(boards: npt.NDArray, chunk_size: int = 1 << 16) -> npt.NDArray[np.int64]:
+    r"""
+    Batch :func:`count_inversions`. Each cell is compared with the cells after
+    it, one cell at a time, so memory grows with ``chunk_size * h * w`` rather
+    than with the number of pairs of cells.
+
+    Args:
+        boards: An array of shape ``(k, h, w)`` (or ``(k, h * w)``).
+        chunk_size: The number of boards compared at once.
+
+    Returns:
+        The inversions of each board.
+    """
+    tiles = boards.reshape(len(boards), -1)
+    n = tiles.shape[1]
+    inversions = np.zeros(len(tiles), dtype=np.int64)
+    for start in range(0, len(tiles), chunk_size):
+        chunk = tiles[start:start + chunk_size]
+        # a view, so the counts are added in place
+        counts = inversions[start:start + chunk_size]
+        for i in range(n - 1):
+            later = chunk[:, i + 1:]
+            counts += ((later < chunk[:, i:i + 1]) & (later != BLANK)).sum(axis=1)
+    return inversions
+
+
+def is_solvable_many(boards: npt.NDArray) -> npt.NDArray[np.bool_]:
+    r"""
+    Batch :func:`is_solvable` of an array of shape ``(k, h, w)``.
+    """
+    _, h, w = boards.shape
+    parity = count_inversions_many(boards) % 2
+    if w % 2 == 0:
+        blank_row = np.argmax(boards.reshape(len(boards), -1) == BLANK, axis=1) // w
+        return (parity + blank_row) % 2 == (h + 1) % 2
+    return parity == 0
 
 
-def visit(visited: set[FrozenBoard], board: Board) -> bool:
+def visit(
+        visited: set[FrozenBoard] | set[PackedBoard],
+        board: Board | PackedBoard,
+) -> bool:
     r"""
     Helper to check if this state already exists. Otherwise, record it.
     Returns True if we have already been here, False otherwise.
 
     Args:
         visited: Set of boards already seen.
-        board: The current board.
+        board: The current board. Packed boards are stored as they are.
 
     Returns:
         True if we've been here before.
     """
-    frozen_board = copy_board(board)
+    frozen_board = board if isinstance(board, int) else copy_board(board)
     if frozen_board in visited:
         return True
     visited.add(frozen_board)
     return False
 
 
-def shuffle(board: Board) -> Board:
+def shuffle(board: Board, rng: Optional[random.Random] = None) -> Board:
+    r"""
+    Mutates the board into a uniformly random solvable board.
+
+    Args:
+        board: The board to shuffle.
+        rng: The random number generator. Default is the global :mod:`random`.
+            See :mod:`generator` to stream many seeded boards.
+    """
     h, w = board.shape
-    while True:
-        for y in range(h):
-            for x in range(w):
-                pos1 = y, x
-                pos2 = random.randrange(h), random.randrange(w)
-                swap_tiles(board, pos1, pos2)
-        if is_solvable(board):
-            return board
+    tiles = board.ravel().tolist()
+    (rng or random).shuffle(tiles)
+    board[:] = np.array(tiles).reshape(h, w)
+    if not is_solvable(board):
+        # swapping two tiles flips solvability
+        a, b = [i for i, tile in enumerate(tiles) if tile != BLANK][:2]
+        swap_tiles(board, divmod(a, w), divmod(b, w))
+    return board
+
 
 def solution_as_tiles(board: Board, solution: Iterable[tuple[int, int]]) -> list[int]:
     r"""
@@ -0,0 +1,211 @@
+import collections
+
+import numpy as np
+
+from board import BLANK, Board
+from path_optimizer import remove_loops
+from solution_table import MAX_TABLE_CELLS, lookup_solution
+
+# the reduction stops once the unsolved block is at most this many rows and columns
+BLOCK_SIZE = 3
+
+
+class Reducer:
+    """
+    Solves a board a row or column at a time, fixing each line of tiles in place
+    and shrinking the unsolved block until it is small enough for the solution
+    table (see :mod:`solution_table`). The solution is far from optimal, but it
+    is found in polynomial time for any board size.
+
+    Args:
+        board: The board, which must be solvable.
+    """
+
+    def __init__(self, board: Board) -> None:
+        self.h, self.w = board.shape
+        self.tiles = board.ravel().tolist()
+        self.blank = self.tiles.index(BLANK)
+        self.locked = [False] * (self.h * self.w)
+        self.moves: list[int] = []
+        self.expanded = 0
+
+    def solve(self) -> list[int]:
+        r"""
+        Returns:
+            The flat blank positions of a solution.
+        """
+        top, left = 0, 0
+        while self.h - top > BLOCK_SIZE or self.w - left > BLOCK_SIZE:
+            # shrink the longer side, so the block ends up square-ish
+            if self.h - top >= self.w - left:
+                self.place_line([top * self.w + x for x in range(left, self.w)], self.w)
+                top += 1
+            else:
+                self.place_line([y * self.w + left for y in range(top, self.h)], 1)
+                left += 1
+        self.solve_block(top, left)
+        return self.moves
+
+    def neighbors(self, cell: int) -> list[int]:
+        y, x = divmod(cell, self.w)
+        cells = []
+        if y > 0:
+            cells.append(cell - self.w)
+        if y < self.h - 1:
+            cells.append(cell + self.w)
+        if x > 0:
+            cells.append(cell - 1)
+        if x < self.w - 1:
+            cells.append(cell + 1)
+        return cells
+
+    def find_path(self, start: int, goal: int) -> list[int]:
+        r"""
+        A shortest path of cells from ``start`` (exclusive) to ``goal`` that
+        avoids the locked cells.
+        """
+        if start == goal:
+            return []
+        parents = {start: start}
+        queue = collections.deque([start])
+        while queue:
+            cell = queue.popleft()
+            self.expanded += 1
+            for next_cell in self.neighbors(cell):
+                if next_cell in parents or self.locked[next_cell]:
+                    continue
+                parents[next_cell] = cell
+                if next_cell == goal:
+                    path = [goal]
+                    while parents[path[-1]] != start:
+                        path.append(parents[path[-1]])
+                    return path[::-1]
+                queue.append(next_cell)
+        raise RuntimeError(f"No path from cell {start} to cell {goal}")
+
+    def move(self, cell: int) -> None:
+        # slides the tile on ``cell`` into the blank
+        self.tiles[self.blank], self.tiles[cell] = self.tiles[cell], BLANK
+        self.blank = cell
+        self.moves.append(cell)
+
+    def move_blank(self, goal: int) -> None:
+        for cell in self.find_path(self.blank, goal):
+            self.move(cell)
+
+    def move_tile(self, tile: int, goal: int) -> None:
+        r"""
+        Walks ``tile`` to ``goal`` one cell at a time, bringing the blank in front
+        of it without disturbing the locked cells.
+        """
+        cell = self.tiles.index(tile)
+        for next_cell in self.find_path(cell, goal):
+            self.locked[cell] = True
+            self.move_blank(next_cell)
+            self.locked[cell] = False
+            self.move(cell)
+            cell = next_cell
+
+    def place_line(self, cells: list[int], inward: int) -> None:
+        r"""
+        Puts the goal tiles of a row or column in place and locks them.
+
+        The last two tiles can't be placed one after the other, since the second
+        would need the blank to pass through the first. Instead both are brought
+        into the 2x3 window at the end of the line, where a small search over
+        their positions and the blank's rotates them in.
+
+        Args:
+            cells: The flat cells of the line, in order.
+            inward: The flat offset from the line into the unsolved block.
+        """
+        for cell in cells[:-2]:
+            self.move_tile(cell + 1, cell)
+            self.locked[cell] = True
+        a, b = cells[-2:]
+        if self.tiles[a] != a + 1 or self.tiles[b] != b + 1:
+            window = (a, b, a + inward, b + inward, a + 2 * inward, b + 2 * inward)
+            self.move_tile(b + 1, a)
+            self.locked[a] = True
+            if self.tiles.index(a + 1) not in window:
+                self.move_tile(a + 1, a + 2 * inward)
+            if self.blank not in window:
+                tile_a = self.tiles.index(a + 1)
+                self.locked[tile_a] = True
+                self.move_blank(b + inward if tile_a != b + inward else a + inward)
+                self.locked[tile_a] = False
+            self.locked[a] = False
+            for cell in self.solve_window(window, a + 1, b + 1):
+                self.move(cell)
+        self.locked[a] = self.locked[b] = True
+
+    def solve_window(self, window: tuple[int, ...], tile_a: int, tile_b: int) -> list[int]:
+        r"""
+        A shortest sequence of blank moves inside ``window`` that puts ``tile_a``
+        on its first cell and ``tile_b`` on its second. The other tiles of the
+        window are free to move.
+        """
+        cells = set(window)
+        start = (self.tiles.index(tile_a), self.tiles.index(tile_b), self.blank)
+        parents = {start: None}
+        queue = collections.deque([start])
+        while queue:
+            state = queue.popleft()
+            pos_a, pos_b, blank = state
+            self.expanded += 1
+            if (pos_a, pos_b) == window[:2]:
+                moves = []
+                while parents[state] is not None:
+                    moves.append(state[2])
+                    state = parents[state]
+                return moves[::-1]
+            for cell in self.neighbors(blank):
+                if cell not in cells:
+                    continue
+                next_state = (
+                    blank if cell == pos_a else pos_a,
+                    blank if cell == pos_b else pos_b,
+                    cell,
+                )
+                if next_state not in parents:
+                    parents[next_state] = state
+                    queue.append(next_state)
+        raise RuntimeError(f"Tiles {tile_a} and {tile_b} can't be placed")
+
+    def solve_block(self, top: int, left: int) -> None:
+        r"""
+        Solves the unsolved bottom-right block optimally with the solution table,
+        renaming its tiles to those of a standalone board of its size.
+        """
+        h, w = self.h - top, self.w - left
+        if h * w > MAX_TABLE_CELLS:
+            raise ValueError(f"The last block ({h}x{w}) is too big for the solution table")
+        cells = [(top + y) * self.w + left + x for y in range(h) for x in range(w)]
+        # the goal tile of each cell of the block, mapped to its tile on the small board
+        names = {cell + 1: i + 1 for i, cell in enumerate(cells[:-1])}
+        names[BLANK] = BLANK
+        block = np.array([names[self.tiles[cell]] for cell in cells]).reshape(h, w)
+        moves, expanded = lookup_solution(block)
+        self.expanded += expanded
+        for move in moves:
+            self.move(cells[move])
+
+
+def solve_constructive(board: Board, shorten: bool = True) -> tuple[list[int], int]:
+    r"""
+    Solves a board of any size with a :class:`Reducer`.
+
+    Args:
+        board: The board, which must be solvable.
+        shorten: Cut the loops of the solution (see :func:`path_optimizer.remove_loops`).
+            Default is ``True``.
+
+    Returns:
+        The flat blank positions of a solution, and the number of cells visited
+        while routing tiles and table entries read.
+    """
+    reducer = Reducer(board)
+    moves = reducer.solve()
+    if shorten:
+        moves = remove_loops(board, moves)
+    return moves, reducer.expanded
@@ -1,19 +1,30 @@
+import bisect
+import collections
 import enum
-from typing import Callable, Iterator, Optional, TypeAlias
+from typing import Callable, Iterator, Optional, Sequence, TypeAlias
 
 import math
 
 
 from board import *
+from pattern_database import pattern_database_delta, pattern_database_distance
 manhattan_tables = {}
+linear_conflict_tables = {}
+walking_distance_tables = {}
+heuristic_deltas = {}
 
 Heuristic: TypeAlias = Callable[[Board], int | float]
+# (parent board, moved tile, tile position before, tile position after) -> change
+HeuristicDelta: TypeAlias = Callable[[PackedBoard, int, int, int], int | float]
 
 
 class Heuristics(enum.Enum):
     MANHATTAN = "Manhattan Distance"
     EUCLIDEAN = "Euclidean Distance"
     HAMMING = "Hamming Distance"
+    PATTERN_DATABASE = "Pattern Database"
+    LINEAR_CONFLICT = "Linear Conflict"
+    WALKING_DISTANCE = "Walking Distance"
 
 
 def euclidean_distance(board: Board) -> float:
@@ -68,3 +79,408 @@ def manhattan_distance(board: Board) -> int:
         for x, tile in enumerate(row):
             dist += table[(y, x, tile)]
     return dist
+
+
+def line_conflicts(h: int, w: int, tiles: Sequence[int], index: int, vertical: bool) -> int:
+    r"""
+    Counts the extra moves forced by tiles that sit in their goal row (or column)
+    but in the wrong order: each of them has to step out of the line and back,
+    and the fewest tiles that must do so are those outside the longest run of
+    correctly ordered tiles.
+
+    Args:
+        h: The board height.
+        w: The board width.
+        tiles: The tiles along the line.
+        index: The row (or column) index of the line.
+        vertical: True if the line is a column.
+
+    Returns:
+        The number of extra moves.
+    """
+    goals = []
+    for tile in tiles:
+        if BLANK == tile:
+            continue
+        goal_y, goal_x = get_goal_yx(h, w, tile)
+        if vertical and goal_x == index:
+            goals.append(goal_y)
+        elif not vertical and goal_y == index:
+            goals.append(goal_x)
+    # longest increasing subsequence
+    run = []
+    for goal in goals:
+        i = bisect.bisect_left(run, goal)
+        if i == len(run):
+            run.append(goal)
+        else:
+            run[i] = goal
+    return 2 * (len(goals) - len(run))
+
+
+class LineConflictTable(dict):
+    r"""
+    Table of :func:`line_conflicts` for one row or column, keyed by the line's
+    tiles packed like :func:`pack_board` packs a board (the first tile in the
+    lowest bits). Entries are filled in the first time a line is seen.
+    """
+
+    def __init__(self, h: int, w: int, index: int, vertical: bool) -> None:
+        super().__init__()
+        self.h, self.w = h, w
+        self.index = index
+        self.vertical = vertical
+
+    def __missing__(self, key: int) -> int:
+        layout = get_layout(self.h, self.w)
+        length = self.h if self.vertical else self.w
+        tiles = [(key >> (i * layout.bits)) & layout.mask for i in range(length)]
+        conflicts = line_conflicts(self.h, self.w, tiles, self.index, self.vertical)
+        self[key] = conflicts
+        return conflicts
+
+
+def prepare_linear_conflict_tables(h, w) -> tuple[list[LineConflictTable], list[LineConflictTable]]:
+    rows = [LineConflictTable(h, w, y, False) for y in range(h)]
+    cols = [LineConflictTable(h, w, x, True) for x in range(w)]
+    return rows, cols
+
+
+def get_linear_conflict_tables(
+        h: int, w: int
+) -> tuple[list[LineConflictTable], list[LineConflictTable]]:
+    tables = linear_conflict_tables.get((h, w), None)
+    if tables is None:
+        tables = prepare_linear_conflict_tables(h, w)
+        linear_conflict_tables[(h, w)] = tables
+    return tables
+
+
+def linear_conflict_distance(board: Board) -> int:
+    r"""
+    Manhattan distance plus the :func:`line_conflicts` of every row and column.
+    """
+    h, w = board.shape
+    bits = get_layout(h, w).bits
+    rows, cols = get_linear_conflict_tables(h, w)
+    if bits * max(h, w) < 63:
+        # pack every row and column at once
+        row_keys = (board << (bits * np.arange(w))).sum(axis=1).tolist()
+        col_keys = (board << (bits * np.arange(h))[:, None]).sum(axis=0).tolist()
+    else:
+        # the keys of long lines overflow int64, pack them as Python ints
+        tiles = board.tolist()
+        row_keys = [sum(tile << (bits * x) for x, tile in enumerate(row)) for row in tiles]
+        col_keys = [sum(tiles[y][x] << (bits * y) for y in range(h)) for x in range(w)]
+
+    dist = manhattan_distance(board)
+    for y, key in enumerate(row_keys):
+        dist += rows[y][key]
+    for x, key in enumerate(col_keys):
+        dist += cols[x][key]
+    return dist
+
+
+def prepare_walking_distance_table(lines: int, size: int) -> dict[bytes, int]:
+    r"""
+    Breadth-first search over the "walking distance" abstraction of a board with
+    ``lines`` rows of ``size`` cells. A state only records how many tiles of each
+    goal row are in each row, plus the row of the blank, and a move swaps the
+    blank with a tile of an adjacent row.
+
+    Returns:
+        A table from state keys (see :func:`walking_distance_key`) to the number
+        of vertical moves needed to solve them.
+    """
+    counts = [0] * (lines * lines)
+    for line in range(lines):
+        counts[line * lines + line] = size
+    counts[-1] -= 1
+    goal = bytes(counts) + bytes([lines - 1])
+    table = {goal: 0}
+    queue = collections.deque([goal])
+    while queue:
+        key = queue.popleft()
+        blank = key[-1]
+        for line in (blank - 1, blank + 1):
+            if not 0 <= line < lines:
+                continue
+            for goal_line in range(lines):
+                if key[line * lines + goal_line] == 0:
+                    continue
+                counts = bytearray(key)
+                counts[line * lines + goal_line] -= 1
+                counts[blank * lines + goal_line] += 1
+                counts[-1] = line
+                next_key = bytes(counts)
+                if next_key not in table:
+                    table[next_key] = table[key] + 1
+                    queue.append(next_key)
+    return table
+
+
+def get_walking_distance_table(lines: int, size: int) -> dict[bytes, int]:
+    table = walking_distance_tables.get((lines, size), None)
+    if table is None:
+        table = prepare_walking_distance_table(lines, size)
+        walking_distance_tables[(lines, size)] = table
+    return table
+
+
+def walking_distance_key(goal_lines: npt.NDArray, blank_line: int) -> bytes:
+    r"""
+    Builds a walking distance state key.
+
+    Args:
+        goal_lines: For each cell, the goal row of its tile (rows are lines), with
+            ``lines`` for the blank.
+        blank_line: The row of the blank.
+    """
+    lines = len(goal_lines)
+    index = np.arange(lines)[:, None] * (lines + 1) + goal_lines
+    counts = np.bincount(index.ravel(), minlength=lines * (lines + 1))
+    counts = counts.reshape(lines, lines + 1)[:, :lines]
+    return counts.astype(np.uint8).tobytes() + bytes([blank_line])
+
+
+def walking_distance(board: Board) -> int:
+    r"""
+    Sum of the vertical and horizontal walking distances (Takahashi). Each one
+    is read from a table built once per board shape, and is a lower bound on the
+    moves along that axis, since it also accounts for tiles that block each other.
+    """
+    h, w = board.shape
+    goal_y = np.array([get_goal_y(h, w, tile) for tile in range(h * w)])
+    goal_x = np.array([get_goal_x(h, w, tile) for tile in range(h * w)])
+    goal_y[BLANK], goal_x[BLANK] = h, w
+    blank_y, blank_x = find_blank(board)
+
+    vertical = walking_distance_key(goal_y[board], int(blank_y))
+    horizontal = walking_distance_key(goal_x[board].T, int(blank_x))
+    return (
+        get_walking_distance_table(h, w)[vertical]
+        + get_walking_distance_table(w, h)[horizontal]
+    )
+
+
+def manhattan_tile_cost(dy: int, dx: int) -> int:
+    return abs(dy) + abs(dx)
+
+
+def hamming_tile_cost(dy: int, dx: int) -> int:
+    return 1 if dy or dx else 0
+
+
+def euclidean_tile_cost(dy: int, dx: int) -> float:
+    return math.sqrt(dy**2 + dx**2)
+
+
+def prepare_tile_cost_table(
+        cost: Callable[[int, int], int | float],
+        h: int,
+        w: int,
+        target: Optional[Board] = None,
+) -> list[list[int | float]]:
+    r"""
+    Tabulates the contribution of every tile at every position for heuristics
+    that are a sum of independent per-tile costs.
+
+    Args:
+        cost: Maps the (dy, dx) offset of a tile from its goal to its cost.
+        h: The board height.
+        w: The board width.
+        target: The board to measure offsets against. Default is the solved board.
+
+    Returns:
+        A table such that ``table[tile][y * w + x]`` is the cost of ``tile`` at (y, x).
+    """
+    if target is None:
+        target = new_board(h, w)
+    table = []
+    for tile in range(h * w):
+        goal_y, goal_x = (int(i) for i in find_tile(target, tile))
+        row = []
+        for y in range(h):
+            for x in range(w):
+                row.append(0 if BLANK == tile else cost(y - goal_y, x - goal_x))
+        table.append(row)
+    return table
+
+
+def tile_cost_delta(
+        cost: Callable[[int, int], int | float]
+) -> Callable[[int, int], HeuristicDelta]:
+    r"""
+    Builds a :data:`HeuristicDelta` factory for a per-tile additive heuristic.
+    Only the moved tile's term changes, so the update is two table lookups.
+    """
+
+    def factory(h: int, w: int) -> HeuristicDelta:
+        table = prepare_tile_cost_table(cost, h, w)
+
+        def delta(board: PackedBoard, tile: int, src: int, dst: int) -> int | float:
+            costs = table[tile]
+            return costs[dst] - costs[src]
+
+        return delta
+
+    return factory
+
+
+def linear_conflict_delta(h: int, w: int) -> HeuristicDelta:
+    r"""
+    Incremental form of :func:`linear_conflict_distance`. A vertical move only
+    changes the two rows involved (the columns keep their order) and a horizontal
+    move only changes the two columns, so four line lookups replace a full pass.
+    """
+    layout = get_layout(h, w)
+    bits, mask = layout.bits, layout.mask
+    row_mask = (1 << (w * bits)) - 1
+    manhattan = get_heuristic_delta(manhattan_distance, h, w)
+    rows, cols = get_linear_conflict_tables(h, w)
+
+    def column_key(board: PackedBoard, x: int) -> int:
+        key = 0
+        for y in range(h):
+            key |= ((board >> ((y * w + x) * bits)) & mask) << (y * bits)
+        return key
+
+    def delta(board: PackedBoard, tile: int, src: int, dst: int) -> int:
+        src_y, src_x = divmod(src, w)
+        dst_y, dst_x = divmod(dst, w)
+        change = manhattan(board, tile, src, dst)
+        if src_y != dst_y:
+            old_src = (board >> (src_y * w * bits)) & row_mask
+            old_dst = (board >> (dst_y * w * bits)) & row_mask
+            new_src = old_src - (tile << (src_x * bits))
+            new_dst = old_dst + (tile << (src_x * bits))
+            line_src, line_dst = rows[src_y], rows[dst_y]
+        else:
+            old_src = column_key(board, src_x)
+            old_dst = column_key(board, dst_x)
+            new_src = old_src - (tile << (src_y * bits))
+            new_dst = old_dst + (tile << (src_y * bits))
+            line_src, line_dst = cols[src_x], cols[dst_x]
+        return (
+            change
+            + line_src[new_src] + line_dst[new_dst]
+            - line_src[old_src] - line_dst[old_dst]
+        )
+
+    return delta
+
+
+def walking_distance_delta(h: int, w: int) -> HeuristicDelta:
+    r"""
+    Incremental form of :func:`walking_distance`. A move only changes the
+    walking distance state of its own axis, by moving one tile between two lines.
+    """
+    layout = get_layout(h, w)
+    bits, mask = layout.bits, layout.mask
+    goal_y = [get_goal_y(h, w, tile) for tile in range(h * w)]
+    goal_x = [get_goal_x(h, w, tile) for tile in range(h * w)]
+    cell_y = [y for y, _ in layout.coords]
+    cell_x = [x for _, x in layout.coords]
+    vertical = get_walking_distance_table(h, w)
+    horizontal = get_walking_distance_table(w, h)
+
+    def delta(board: PackedBoard, tile: int, src: int, dst: int) -> int:
+        if cell_y[src] != cell_y[dst]:
+            lines, table, goal, line_of = h, vertical, goal_y, cell_y
+        else:
+            lines, table, goal, line_of = w, horizontal, goal_x, cell_x
+        counts = bytearray(lines * lines + 1)
+        for cell in range(h * w):
+            other = (board >> (cell * bits)) & mask
+            if BLANK != other:
+                counts[line_of[cell] * lines + goal[other]] += 1
+        # the blank is where the tile is going
+        counts[-1] = line_of[dst]
+        before = table[bytes(counts)]
+        counts[line_of[src] * lines + goal[tile]] -= 1
+        counts[line_of[dst] * lines + goal[tile]] += 1
+        counts[-1] = line_of[src]
+        return table[bytes(counts)] - before
+
+    return delta
+
+
+TILE_COSTS: dict[Heuristic, Callable[[int, int], int | float]] = {
+    manhattan_distance: manhattan_tile_cost,
+    hamming_distance: hamming_tile_cost,
+    euclidean_distance: euclidean_tile_cost,
+}
+
+
+def get_target_heuristic(
+        heuristic: Heuristic, target: Board
+) -> tuple[Heuristic, HeuristicDelta]:
+    r"""
+    Builds a heuristic (and its delta) estimating the distance to ``target``
+    instead of the solved board, e.g. for the backward half of a bidirectional
+    search. Per-tile additive heuristics keep their own costs; any other
+    heuristic is replaced by the Manhattan distance to ``target``.
+
+    Args:
+        heuristic: The heuristic function.
+        target: The board to estimate the distance to.
+
+    Returns:
+        The heuristic and its :data:`HeuristicDelta`.
+    """
+    h, w = target.shape
+    cost = TILE_COSTS.get(heuristic, manhattan_tile_cost)
+    table = prepare_tile_cost_table(cost, h, w, target)
+
+    def distance(board: Board) -> int | float:
+        return sum(table[tile][i] for i, tile in enumerate(board.flat))
+
+    def delta(board: PackedBoard, tile: int, src: int, dst: int) -> int | float:
+        costs = table[tile]
+        return costs[dst] - costs[src]
+
+    return distance, delta
+
+
+DELTA_FACTORIES: dict[Heuristic, Callable[[int, int], HeuristicDelta]] = {
+    manhattan_distance: tile_cost_delta(manhattan_tile_cost),
+    hamming_distance: tile_cost_delta(hamming_tile_cost),
+    euclidean_distance: tile_cost_delta(euclidean_tile_cost),
+    pattern_database_distance: pattern_database_delta,
+    linear_conflict_distance: linear_conflict_delta,
+    walking_distance: walking_distance_delta,
+}
+
+
+def get_heuristic_delta(heuristic: Heuristic, h: int, w: int) -> Optional[HeuristicDelta]:
+    r"""
+    Looks up the incremental form of a heuristic, so that the value of a child
+    can be computed as the parent's value plus a delta for the moved tile.
+
+    Args:
+        heuristic: The heuristic function.
+        h: The board height.
+        w: The board width.
+
+    Returns:
+        The delta function, or None if the heuristic has to be evaluated in full.
+    """
+    factory = DELTA_FACTORIES.get(heuristic)
+    if factory is None:
+        return None
+    key = (heuristic, h, w)
+    delta = heuristic_deltas.get(key, None)
+    if delta is None:
+        delta = factory(h, w)
+        heuristic_deltas[key] = delta
+    return delta
+
+
+HEURISTICS_MAP: dict[Heuristics, Heuristic] = {
+    Heuristics.MANHATTAN: manhattan_distance,
+    Heuristics.EUCLIDEAN: euclidean_distance,
+    Heuristics.HAMMING: hamming_distance,
+    Heuristics.PATTERN_DATABASE: pattern_database_distance,
+    Heuristics.LINEAR_CONFLICT: linear_conflict_distance,
+    Heuristics.WALKING_DISTANCE: walking_distance,
+}
@@ -0,0 +1,269 @@
+import argparse
+import dataclasses
+import logging
+import os
+import tempfile
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from board import Layout, PackedBoard, get_layout
+from frontier import check_layout, contains_sorted, encode_boards, expand_frontier, find_blanks, get_key_dtype
+
+log = logging.getLogger(__name__)
+
+# boards read from a layer file (and expanded) at once, about 100 bytes each
+CHUNK_SIZE = 1 << 20
+# sorted runs merged at once, more are merged in several passes
+MAX_RUNS = 64
+
+
+@dataclasses.dataclass
+class LayerFiles:
+    """
+    The BFS layers of an external-memory search. Layer ``d`` is a file of the
+    sorted, distinct board keys (see :func:`frontier.get_key_dtype`) at distance ``d``.
+
+    Args:
+        paths: The file of each layer. They are deleted once a search ends,
+            unless it was run with ``keep_layers=True``.
+        sizes: The number of boards on each layer.
+        layout: The layout of the boards.
+    """
+    paths: list[str]
+    sizes: list[int]
+    layout: Layout
+
+    def __len__(self) -> int:
+        return sum(self.sizes)
+
+    def load(self, depth: int) -> npt.NDArray:
+        return load_layer(self.paths[depth], self.layout)
+
+
+def get_layer_path(directory: str, depth: int) -> str:
+    return os.path.join(directory, f"layer_{depth:03d}.bin")
+
+
+def load_layer(path: str, layout: Layout) -> npt.NDArray:
+    r"""
+    Memory-maps a layer file, so it can be binary searched without reading it.
+    """
+    if not os.path.getsize(path):
+        return np.zeros(0, dtype=get_key_dtype(layout))
+    return np.memmap(path, dtype=get_key_dtype(layout), mode="r")
+
+
+def iter_layer(path: str, layout: Layout, chunk_size: int = CHUNK_SIZE) -> Iterator[npt.NDArray]:
+    r"""
+    Reads a layer file in chunks of at most ``chunk_size`` boards.
+    """
+    with open(path, "rb") as file:
+        while True:
+            chunk = np.fromfile(file, dtype=get_key_dtype(layout), count=chunk_size)
+            if not len(chunk):
+                return
+            yield chunk
+
+
+class LayerReader:
+    """
+    Streams a sorted file in blocks, handing out its boards in increasing order.
+    """
+
+    def __init__(self, path: str, layout: Layout, block_size: int) -> None:
+        self.file = open(path, "rb")
+        self.dtype = get_key_dtype(layout)
+        self.block_size = block_size
+        self.buffer = np.zeros(0, dtype=self.dtype)
+
+    def fill(self) -> bool:
+        r"""
+        Reads the next block if the buffer is empty.
+
+        Returns:
+            ``False`` once the file is exhausted.
+        """
+        if not len(self.buffer) and not self.file.closed:
+            self.buffer = np.fromfile(self.file, dtype=self.dtype, count=self.block_size)
+            if not len(self.buffer):
+                self.file.close()
+        return bool(len(self.buffer))
+
+    def take_until(self, bound: np.generic) -> npt.NDArray:
+        r"""
+        Removes and returns every remaining board up to ``bound`` (inclusive).
+        """
+        parts = []
+        while self.fill():
+            i = np.searchsorted(self.buffer, bound, side="right")
+            parts.append(self.buffer[:i])
+            self.buffer = self.buffer[i:]
+            if len(self.buffer):
+                break
+        return np.concatenate(parts) if parts else self.buffer[:0]
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def write_run(directory: str, boards: npt.NDArray) -> str:
+    r"""
+    Writes sorted boards to a new temporary file in ``directory``.
+    """
+    fd, path = tempfile.mkstemp(dir=directory, suffix=".run")
+    with os.fdopen(fd, "wb") as file:
+        boards.tofile(file)
+    return path
+
+
+def merge_runs(
+        runs: list[str],
+        out_path: str,
+        layout: Layout,
+        exclude: tuple[str, ...] = (),
+        chunk_size: int = CHUNK_SIZE,
+) -> int:
+    r"""
+    Merges sorted run files into one sorted file of distinct boards, dropping
+    the boards found in the sorted files ``exclude``. Every file is streamed, so
+    only about ``chunk_size`` boards of each kind are in memory at once. The runs
+    are deleted.
+
+    Returns:
+        The number of boards written.
+    """
+    directory = os.path.dirname(out_path)
+    while len(runs) > MAX_RUNS:
+        # too many files to stream at once, merge them in groups first
+        groups = [runs[i:i + MAX_RUNS] for i in range(0, len(runs), MAX_RUNS)]
+        runs = []
+        for group in groups:
+            fd, path = tempfile.mkstemp(dir=directory, suffix=".run")
+            os.close(fd)
+            merge_runs(group, path, layout, chunk_size=chunk_size)
+            runs.append(path)
+
+    block_size = max(1, chunk_size // len(runs)) if runs else chunk_size
+    readers = [LayerReader(run, layout, block_size) for run in runs]
+    excluded = [LayerReader(path, layout, chunk_size) for path in exclude]
+    size = 0
+    with open(out_path, "wb") as file:
+        while True:
+            active = [reader for reader in readers if reader.fill()]
+            if not active:
+                break
+            # every board up to the smallest buffered maximum can be merged now
+            bound = np.sort(np.concatenate([reader.buffer[-1:] for reader in active]))[0]
+            boards = np.unique(np.concatenate([reader.take_until(bound) for reader in active]))
+            for reader in excluded:
+                boards = boards[~contains_sorted(boards, reader.take_until(bound))]
+            boards.tofile(file)
+            size += len(boards)
+    for reader in readers + excluded:
+        reader.close()
+    for run in runs:
+        os.remove(run)
+    return size
+
+
+def expand_layer(
+        path: str, layout: Layout, chunk_size: int = CHUNK_SIZE
+) -> Iterator[tuple[str, int, int]]:
+    r"""
+    Expands a layer file one chunk at a time, writing the sorted, distinct
+    children of each chunk to a run file next to it.
+
+    Yields:
+        The run file, the number of boards expanded and the number of children
+        generated, for each chunk.
+    """
+    directory = os.path.dirname(path)
+    for boards in iter_layer(path, layout, chunk_size):
+        children, _, _ = expand_frontier(boards, find_blanks(boards, layout), layout)
+        yield write_run(directory, np.unique(children)), len(boards), len(children)
+
+
+def next_layer(
+        directory: str, depth: int, layout: Layout, chunk_size: int = CHUNK_SIZE
+) -> tuple[int, int, int]:
+    r"""
+    Builds layer ``depth + 1`` from layer ``depth``, removing the duplicates of
+    the two layers before it (the only ones a neighbour can be on).
+
+    Returns:
+        The size of the new layer, and the number of boards expanded and generated.
+    """
+    runs, expanded, generated = [], 0, 0
+    for run, n_expanded, n_generated in expand_layer(get_layer_path(directory, depth), layout, chunk_size):
+        runs.append(run)
+        expanded += n_expanded
+        generated += n_generated
+    exclude = tuple(get_layer_path(directory, d) for d in (depth, depth - 1) if d >= 0)
+    size = merge_runs(runs, get_layer_path(directory, depth + 1), layout, exclude, chunk_size)
+    return size, expanded, generated
+
+
+def write_initial_layer(directory: str, boards: Sequence[PackedBoard], layout: Layout) -> int:
+    boards = np.unique(encode_boards(boards, layout))
+    boards.tofile(get_layer_path(directory, 0))
+    return len(boards)
+
+
+def distance_distribution(
+        h: int,
+        w: int,
+        directory: Optional[str] = None,
+        chunk_size: int = CHUNK_SIZE,
+        max_depth: Optional[int] = None,
+) -> list[int]:
+    r"""
+    Counts the boards at each distance from the goal with an external-memory
+    breadth-first search. Only three layers are kept on disk at a time.
+
+    Args:
+        h: The board height.
+        w: The board width.
+        directory: Where the layer files are written. Defaults to the system's
+            temporary directory.
+        chunk_size: The number of boards held in memory at once.
+        max_depth: Stop after this many layers. Default is ``None``.
+
+    Returns:
+        The number of boards at each distance.
+    """
+    layout = get_layout(h, w)
+    check_layout(layout)
+    sizes = []
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        sizes.append(write_initial_layer(tmp, [layout.goal], layout))
+        while sizes[-1] and (max_depth is None or len(sizes) <= max_depth):
+            depth = len(sizes) - 1
+            size, _, _ = next_layer(tmp, depth, layout, chunk_size)
+            log.info(f"depth {depth + 1}: {size} boards")
+            if depth >= 1:
+                os.remove(get_layer_path(tmp, depth - 1))
+            sizes.append(size)
+    if not sizes[-1]:
+        sizes.pop()
+    return sizes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Count the boards at each distance from the goal.")
+    parser.add_argument("h", type=int)
+    parser.add_argument("w", type=int)
+    parser.add_argument("--directory", help="where layer files are written")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--max-depth", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    sizes = distance_distribution(args.h, args.w, args.directory, args.chunk_size, args.max_depth)
+    for depth, size in enumerate(sizes):
+        print(depth, size)
+    print("total", sum(sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import functools
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from board import BLANK, Layout, PackedBoard, get_goal_yx
+
+# boards that fit in 64 bits (up to 4x4) are keyed by their packed uint64,
+# larger ones by their tiles as bytes, which limits them to 256 cells (16x16)
+MAX_FRONTIER_BITS = 64
+MAX_FRONTIER_CELLS = 256
+
+
+def check_layout(layout: Layout) -> None:
+    r"""
+    Raises a ``ValueError`` if boards of this layout can't be keyed (see
+    :func:`get_key_dtype`).
+    """
+    if layout.h * layout.w > MAX_FRONTIER_CELLS:
+        raise ValueError(
+            f"{layout.h}x{layout.w} boards have {layout.h * layout.w} cells, "
+            f"vectorized searches are limited to {MAX_FRONTIER_CELLS}."
+        )
+
+
+def fits_uint64(layout: Layout) -> bool:
+    return layout.h * layout.w * layout.bits <= MAX_FRONTIER_BITS
+
+
+@functools.cache
+def get_key_dtype(layout: Layout) -> np.dtype:
+    r"""
+    The dtype of the board keys used by vectorized searches: the packed board
+    as a ``uint64`` when it fits, otherwise the tiles (in row-major order) as
+    ``h * w`` bytes. Either way keys can be sorted, ``np.unique``-ed and binary
+    searched, and equal keys are equal boards.
+    """
+    if fits_uint64(layout):
+        return np.dtype(np.uint64)
+    return np.dtype((np.void, layout.h * layout.w))
+
+
+def encode_boards(boards: Sequence[PackedBoard], layout: Layout) -> npt.NDArray:
+    r"""
+    Converts packed boards (see :func:`board.pack_board`) to keys.
+    """
+    if fits_uint64(layout):
+        return np.array(boards, dtype=np.uint64)
+    n = layout.h * layout.w
+    tiles = np.array(
+        [[(board >> (i * layout.bits)) & layout.mask for i in range(n)] for board in boards],
+        dtype=np.uint8,
+    ).reshape(len(boards), n)
+    return pack_tiles(tiles, layout)
+
+
+def decode_board(key: np.generic, layout: Layout) -> PackedBoard:
+    r"""
+    Converts a key back to a packed board.
+    """
+    if fits_uint64(layout):
+        return int(key)
+    packed = 0
+    for i, tile in enumerate(bytes(key)):
+        packed |= tile << (i * layout.bits)
+    return packed
+
+
+def pack_tiles(tiles: npt.NDArray[np.uint8], layout: Layout) -> npt.NDArray:
+    r"""
+    Converts an array of shape ``(count, h * w)`` of tiles to keys.
+    """
+    if fits_uint64(layout):
+        shifts = (np.arange(tiles.shape[1], dtype=np.uint64) * np.uint64(layout.bits))[None, :]
+        return np.bitwise_or.reduce(tiles.astype(np.uint64) << shifts, axis=1)
+    return np.ascontiguousarray(tiles, dtype=np.uint8).view(get_key_dtype(layout)).ravel()
+
+
+@functools.cache
+def get_neighbor_table(layout: Layout) -> npt.NDArray[np.int64]:
+    r"""
+    The cell the blank moves to, for every blank position (rows) and move in
+    :attr:`board.Layout.moves` order (columns), or ``-1`` where there is no move.
+    """
+    n = layout.h * layout.w
+    neighbors = np.full((n, 4), -1, dtype=np.int64)
+    for blank, moves in enumerate(layout.moves):
+        for d, (move, _, _) in enumerate(moves):
+            neighbors[blank, d] = move
+    return neighbors
+
+
+def unpack_boards(boards: npt.NDArray, layout: Layout) -> npt.NDArray[np.uint8]:
+    r"""
+    Vectorized :func:`board.unpack_board` of keys.
+
+    Returns:
+        An array of shape ``(len(boards), h * w)`` with the tile on each cell.
+    """
+    n = layout.h * layout.w
+    if not fits_uint64(layout):
+        return np.ascontiguousarray(boards).view(np.uint8).reshape(len(boards), n)
+    shifts = (np.arange(n, dtype=np.uint64) * np.uint64(layout.bits))[None, :]
+    return ((boards[:, None] >> shifts) & np.uint64(layout.mask)).astype(np.uint8)
+
+
+def find_blanks(boards: npt.NDArray, layout: Layout) -> npt.NDArray[np.int64]:
+    r"""
+    The flat index of the blank on each packed board.
+    """
+    return np.argmax(unpack_boards(boards, layout) == BLANK, axis=1)
+
+
+def expand_frontier(
+        boards: npt.NDArray, blanks: npt.NDArray[np.int64], layout: Layout
+) -> tuple[npt.NDArray, npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    r"""
+    Generates every child of a frontier of board keys (see :func:`get_key_dtype`)
+    at once.
+
+    Args:
+        boards: The board keys.
+        blanks: The blank position of each board.
+        layout: The board layout.
+
+    Returns:
+        The child boards, their blank positions, and the index of each child's
+        parent in ``boards``.
+    """
+    neighbors = get_neighbor_table(layout)
+    if not fits_uint64(layout):
+        return _expand_tiles(boards, blanks, layout, neighbors)
+    bits, mask = np.uint64(layout.bits), np.uint64(layout.mask)
+    children, child_blanks, parents = [], [], []
+    for d in range(neighbors.shape[1]):
+        move = neighbors[blanks, d]
+        rows = np.flatnonzero(move >= 0)
+        move = move[rows]
+        parent = boards[rows]
+        move_shift = move.astype(np.uint64) * bits
+        blank_shift = blanks[rows].astype(np.uint64) * bits
+        # the blank is 0, so the tile is cleared from its cell and set on the blank's
+        tile = (parent >> move_shift) & mask
+        children.append(parent ^ (tile << move_shift) ^ (tile << blank_shift))
+        child_blanks.append(move)
+        parents.append(rows)
+    return np.concatenate(children), np.concatenate(child_blanks), np.concatenate(parents)
+
+
+def _expand_tiles(
+        boards: npt.NDArray, blanks: npt.NDArray[np.int64], layout: Layout, neighbors: npt.NDArray
+) -> tuple[npt.NDArray, npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    # expand_frontier of byte keys, the moved tile is copied to the blank's cell
+    tiles = unpack_boards(boards, layout)
+    children, child_blanks, parents = [], [], []
+    for d in range(neighbors.shape[1]):
+        move = neighbors[blanks, d]
+        rows = np.flatnonzero(move >= 0)
+        move = move[rows]
+        child = tiles[rows]
+        index = np.arange(len(rows))
+        child[index, blanks[rows]] = child[index, move]
+        child[index, move] = BLANK
+        children.append(pack_tiles(child, layout))
+        child_blanks.append(move)
+        parents.append(rows)
+    return np.concatenate(children), np.concatenate(child_blanks), np.concatenate(parents)
+
+
+def contains_sorted(values: npt.NDArray, sorted_values: npt.NDArray) -> npt.NDArray[np.bool_]:
+    r"""
+    Whether each of ``values`` is in ``sorted_values`` (which must be sorted),
+    using a binary search instead of a hash set.
+    """
+    if not len(sorted_values):
+        return np.zeros(len(values), dtype=bool)
+    index = np.searchsorted(sorted_values, values)
+    index[index == len(sorted_values)] = 0
+    return sorted_values[index] == values
+
+
+@functools.cache
+def get_manhattan_table(layout: Layout) -> npt.NDArray[np.int64]:
+    r"""
+    ``table[tile, cell]`` is the Manhattan distance of ``tile`` on ``cell`` to
+    its goal (``0`` for the blank).
+    """
+    n = layout.h * layout.w
+    table = np.zeros((n, n), dtype=np.int64)
+    for tile in range(1, n):
+        gy, gx = get_goal_yx(layout.h, layout.w, tile)
+        for cell, (y, x) in enumerate(layout.coords):
+            table[tile, cell] = abs(gy - y) + abs(gx - x)
+    return table
+
+
+def manhattan_distances(boards: npt.NDArray, layout: Layout) -> npt.NDArray[np.int64]:
+    r"""
+    Batch :func:`euristicas.manhattan_distance` of packed boards.
+    """
+    tiles = unpack_boards(boards, layout)
+    cells = np.arange(tiles.shape[1])[None, :]
+    return get_manhattan_table(layout)[tiles, cells].sum(axis=1)
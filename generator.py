@@ -0,0 +1,196 @@
+import argparse
+import logging
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from board import BLANK, Board, get_layout, is_solvable_many, new_board
+from frontier import get_neighbor_table
+from solution_table import MAX_TABLE_CELLS, table_distances
+
+# boards generated at once
+BATCH_SIZE = 4096
+# batches of candidates in a row that may add no board before a depth band is given up
+MAX_ATTEMPTS = 100
+
+
+def random_boards(
+        h: int, w: int, count: int, seed: Optional[int] = None, batch_size: int = BATCH_SIZE
+) -> Iterator[npt.NDArray]:
+    r"""
+    Streams uniformly random solvable boards. Each board is a random permutation
+    of the tiles; the unsolvable half is fixed by swapping two tiles, which
+    flips the parity (and so solvability) without biasing the distribution.
+
+    Args:
+        h: The board height.
+        w: The board width.
+        count: The number of boards.
+        seed: Seeds the generator, so that the same boards are streamed again.
+        batch_size: The number of boards per batch.
+
+    Returns:
+        An iterator over arrays of shape ``(batch, h, w)``.
+    """
+    rng = np.random.default_rng(seed)
+    n = h * w
+    for start in range(0, count, batch_size):
+        k = min(batch_size, count - start)
+        tiles = rng.permuted(np.tile(np.arange(n), (k, 1)), axis=1)
+        boards = tiles.reshape(k, h, w)
+        rows = np.flatnonzero(~is_solvable_many(boards))
+        # the first two cells without the blank
+        cells = np.argsort(tiles[rows] == BLANK, axis=1, kind="stable")[:, :2]
+        first, second = cells[:, 0], cells[:, 1]
+        tiles[rows, first], tiles[rows, second] = tiles[rows, second], tiles[rows, first]
+        yield boards
+
+
+def random_walk_boards(
+        h: int,
+        w: int,
+        count: int,
+        length: int,
+        seed: Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+) -> Iterator[npt.NDArray]:
+    r"""
+    Streams the boards reached by ``length`` random moves from the goal, never
+    undoing the previous move. All the walks of a batch are taken at once.
+
+    Args:
+        h: The board height.
+        w: The board width.
+        count: The number of boards.
+        length: The number of moves of each walk.
+        seed: Seeds the generator, so that the same boards are streamed again.
+        batch_size: The number of boards per batch.
+
+    Returns:
+        An iterator over arrays of shape ``(batch, h, w)``.
+    """
+    rng = np.random.default_rng(seed)
+    neighbors = get_neighbor_table(get_layout(h, w))
+    goal = new_board(h, w).ravel()
+    for start in range(0, count, batch_size):
+        k = min(batch_size, count - start)
+        rows = np.arange(k)
+        tiles = np.tile(goal, (k, 1))
+        blank = np.full(k, h * w - 1)
+        prev = np.full(k, -1)
+        for _ in range(length):
+            options = neighbors[blank]
+            valid = (options >= 0) & (options != prev[:, None])
+            # a random valid move for every board
+            move = options[rows, np.argmax(rng.random(options.shape) * valid, axis=1)]
+            tiles[rows, blank] = tiles[rows, move]
+            tiles[rows, move] = BLANK
+            blank, prev = move, blank
+        yield tiles.reshape(k, h, w)
+
+
+def depth_band_boards(
+        h: int,
+        w: int,
+        count: int,
+        min_depth: int,
+        max_depth: int,
+        seed: Optional[int] = None,
+        batch_size: int = BATCH_SIZE,
+        distance: Optional[Callable[[Board], int]] = None,
+) -> Iterator[npt.NDArray]:
+    r"""
+    Streams random boards whose optimal solution lengths are spread evenly over
+    ``[min_depth, max_depth]``: ``count`` is split between the depths of the band
+    and each depth is filled by rejection. Candidates alternate between random
+    walks of as many moves as a depth that is still missing (which often end at
+    that depth) and uniformly random boards (which reach the deepest boards).
+    Each batch is shuffled, so its depths are mixed.
+
+    Args:
+        h: The board height.
+        w: The board width.
+        count: The number of boards.
+        min_depth: The shortest optimal solution allowed.
+        max_depth: The longest optimal solution allowed.
+        seed: Seeds the generator, so that the same boards are streamed again.
+        batch_size: The number of boards per batch.
+        distance: Computes the optimal solution length of a board. Default is
+            the solution table for boards of up to 9 tiles; larger boards need
+            a solver, e.g. ``lambda board: len(search(board, "ida*").solution)``.
+
+    Returns:
+        An iterator over arrays of shape ``(batch, h, w)``.
+
+    Raises:
+        ValueError: If the band is empty, or :data:`MAX_ATTEMPTS` batches of
+            candidates in a row add no board, e.g. because the band is deeper
+            than any board.
+    """
+    if distance is None and h * w > MAX_TABLE_CELLS:
+        raise ValueError(f"{h}x{w} boards need a distance function to measure their depth.")
+    if not 0 <= min_depth <= max_depth:
+        raise ValueError(f"The depth band [{min_depth}, {max_depth}] is empty.")
+    rng = np.random.default_rng(seed)
+    depths = np.arange(min_depth, max_depth + 1)
+    # the boards still needed at each depth, the remainder going to random depths
+    quota = np.full(len(depths), count // len(depths))
+    quota[rng.choice(len(depths), count % len(depths), replace=False)] += 1
+    pending, batches, attempts = [], 0, 0
+    while quota.any():
+        # each batch of candidates gets its own seed, drawn from the generator
+        candidate_seed = int(rng.integers(1 << 63))
+        if batches % 2:
+            candidates = next(random_boards(h, w, batch_size, candidate_seed, batch_size))
+        else:
+            length = int(depths[rng.choice(np.flatnonzero(quota))])
+            candidates = next(random_walk_boards(h, w, batch_size, length, candidate_seed, batch_size))
+        batches += 1
+        if distance is None:
+            candidate_depths = table_distances(candidates)
+        else:
+            candidate_depths = np.array([distance(board) for board in candidates])
+        attempts += 1
+        for i, depth in enumerate(depths):
+            boards = candidates[candidate_depths == depth][:quota[i]]
+            if len(boards):
+                pending.append(boards)
+                quota[i] -= len(boards)
+                attempts = 0
+        if attempts >= MAX_ATTEMPTS:
+            missing = depths[quota > 0].tolist()
+            raise ValueError(f"No {h}x{w} boards found at depths {missing} in {MAX_ATTEMPTS} batches.")
+        if sum(len(b) for b in pending) >= batch_size or not quota.any():
+            batch = rng.permutation(np.concatenate(pending))
+            pending = []
+            for i in range(0, len(batch), batch_size):
+                yield batch[i:i + batch_size]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write reproducible random boards, one per line.")
+    parser.add_argument("h", type=int)
+    parser.add_argument("w", type=int)
+    parser.add_argument("count", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--walk-length", type=int, help="random walks of this length from the goal")
+    parser.add_argument(
+        "--band", type=lambda s: tuple(int(i) for i in s.split(",")),
+        help="MIN,MAX optimal solution lengths (boards up to 3x3)",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if args.band is not None:
+        batches = depth_band_boards(args.h, args.w, args.count, *args.band, seed=args.seed)
+    elif args.walk_length is not None:
+        batches = random_walk_boards(args.h, args.w, args.count, args.walk_length, args.seed)
+    else:
+        batches = random_boards(args.h, args.w, args.count, args.seed)
+    for batch in batches:
+        for board in batch:
+            print(" ".join(str(tile) for tile in board.ravel()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+import dataclasses
+import functools
+import inspect
+import logging
+import time
+from typing import Any, Callable, Optional
+
+from board import Board
+
+log = logging.getLogger(__name__)
+
+# searches report to their monitor every this many expansions
+CHECK_INTERVAL = 1024
+
+# rough per-entry costs (bytes) used for the memory estimate
+STATE_BYTES = 120
+VISITED_BYTES = 70
+NODE_BYTES = 10
+
+
+@dataclasses.dataclass
+class SearchProgress:
+    """
+    Args:
+        algorithm: The name of the search function.
+        elapsed: Seconds since the search started.
+        generated: The number of states generated so far.
+        expanded: The number of states expanded so far.
+        generated_per_second: Average generation rate.
+        expanded_per_second: Average expansion rate.
+        open: The size of the open list (or current path, for depth-first searches).
+        visited: The size of the visited set.
+        nodes: The number of back-pointers recorded.
+        bound: The current f-bound, f-value or depth, depending on the search.
+        memory: A rough estimate of the bytes held by the search.
+        phases: Seconds spent in each instrumented phase ("expansion", "heuristic",
+            "heap"). Each phase excludes the time of the phases nested inside it.
+    """
+    algorithm: str
+    elapsed: float
+    generated: int
+    expanded: int
+    generated_per_second: float
+    expanded_per_second: float
+    open: int
+    visited: int
+    nodes: int
+    bound: Optional[float]
+    memory: int
+    phases: dict[str, float]
+
+
+class SearchObserver:
+    """
+    Receives progress reports from a search. Subclasses override the events they
+    are interested in. Pass an instance as the ``observer`` argument of any search;
+    a plain function is used as :meth:`on_progress`.
+    """
+
+    def on_start(self, algorithm: str, board: Board) -> None:
+        pass
+
+    def on_progress(self, progress: SearchProgress) -> None:
+        pass
+
+    def on_finish(self, progress: SearchProgress, result: Any) -> None:
+        pass
+
+
+class LoggingObserver(SearchObserver):
+    """
+    Logs search progress, e.g. to find searches that stall in production.
+    """
+
+    def __init__(self, level: int = logging.INFO) -> None:
+        self.level = level
+
+    def on_progress(self, progress: SearchProgress) -> None:
+        log.log(
+            self.level,
+            f"{progress.algorithm}: {progress.elapsed:.1f}s, "
+            f"expanded={progress.expanded} ({progress.expanded_per_second:.0f}/s), "
+            f"open={progress.open}, visited={progress.visited}, "
+            f"bound={progress.bound}, memory~{progress.memory >> 20}MiB, "
+            f"phases={ {phase: round(t, 3) for phase, t in progress.phases.items()} }",
+        )
+
+    def on_finish(self, progress: SearchProgress, result: Any) -> None:
+        self.on_progress(progress)
+
+
+class _CallbackObserver(SearchObserver):
+    def __init__(self, callback: Callable[[SearchProgress], None]) -> None:
+        self.callback = callback
+
+    def on_progress(self, progress: SearchProgress) -> None:
+        self.callback(progress)
+
+
+class SearchMonitor:
+    """
+    Collects the statistics of one search, forwards them to its observer at
+    most once per ``interval`` seconds and enforces its budgets.
+
+    Args:
+        algorithm: The name of the search function.
+        observer: Receives the progress reports.
+        interval: Seconds between progress reports.
+        time_limit: Wall-clock budget in seconds.
+        node_limit: Budget on the number of expanded states.
+        memory_limit: Budget in bytes on :attr:`SearchProgress.memory`.
+    """
+
+    def __init__(
+            self,
+            algorithm: str,
+            observer: SearchObserver,
+            interval: float = 1.0,
+            time_limit: Optional[float] = None,
+            node_limit: Optional[int] = None,
+            memory_limit: Optional[int] = None,
+    ) -> None:
+        self.algorithm = algorithm
+        self.observer = observer
+        self.interval = interval
+        self.time_limit = time_limit
+        self.node_limit = node_limit
+        self.memory_limit = memory_limit
+        self.limited = any(limit is not None for limit in (time_limit, node_limit, memory_limit))
+        # small node budgets are checked more often so they aren't overshot
+        self.check_interval = min(CHECK_INTERVAL, node_limit or CHECK_INTERVAL)
+        self.stop_reason: Optional[str] = None
+        self.phases: dict[str, float] = {}
+        self.start_time = self.last_report = time.perf_counter()
+        self.last: tuple = (0, 0, 0, 0, None, 0)
+        self.state_bytes, self.visited_bytes, self.fixed_bytes = STATE_BYTES, VISITED_BYTES, 0
+        self._nested = 0.0
+
+    def start(self, board: Board) -> None:
+        self.start_time = self.last_report = time.perf_counter()
+        self.observer.on_start(self.algorithm, board)
+
+    def finish(self, result: Any) -> None:
+        _, _, _, _, bound, nodes = self.last
+        self.last = (
+            result.generated,
+            result.expanded,
+            len(result.unvisited),
+            len(result.visited),
+            bound,
+            nodes,
+        )
+        self.observer.on_finish(self.progress(), result)
+
+    def track_visited(self, visited: Any) -> None:
+        r"""
+        Uses the real size of visited sets that report one (as ``nbytes``, e.g.
+        :class:`visited.BitsetVisited`) in the memory estimate.
+        """
+        nbytes = getattr(visited, "nbytes", None)
+        if nbytes is not None:
+            self.visited_bytes, self.fixed_bytes = 0, nbytes
+
+    def set_entry_bytes(self, state: int, visited: int) -> None:
+        r"""
+        Sets the bytes per open-list and visited entry used in the memory
+        estimate, for searches that store states more compactly.
+        """
+        self.state_bytes, self.visited_bytes = state, visited
+
+    def wrap(self, phase: str, fn: Optional[Callable]) -> Optional[Callable]:
+        r"""
+        Returns ``fn`` wrapped so that time spent in it is added to ``phase``.
+        """
+        if fn is None:
+            return None
+        self.phases.setdefault(phase, 0.0)
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            nested, self._nested = self._nested, 0.0
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                spent = time.perf_counter() - start
+                self.phases[phase] += spent - self._nested
+                self._nested = nested + spent
+
+        return timed
+
+    def update(
+            self,
+            generated: int,
+            expanded: int,
+            open_size: int,
+            visited_size: int,
+            bound: Optional[float] = None,
+            nodes: int = 0,
+    ) -> Optional[str]:
+        r"""
+        Records the current statistics. Searches call this every
+        :attr:`check_interval` expansions and stop if it returns a reason.
+
+        Returns:
+            ``"time"``, ``"nodes"`` or ``"memory"`` if that budget is exhausted,
+            otherwise ``None``.
+        """
+        self.last = (generated, expanded, open_size, visited_size, bound, nodes)
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.observer.on_progress(self.progress(now))
+        if self.time_limit is not None and now - self.start_time >= self.time_limit:
+            self.stop_reason = "time"
+        elif self.node_limit is not None and expanded >= self.node_limit:
+            self.stop_reason = "nodes"
+        elif self.memory_limit is not None and self.memory() >= self.memory_limit:
+            self.stop_reason = "memory"
+        return self.stop_reason
+
+    def memory(self) -> int:
+        _, _, open_size, visited_size, _, nodes = self.last
+        return (
+            open_size * self.state_bytes
+            + visited_size * self.visited_bytes
+            + nodes * NODE_BYTES
+            + self.fixed_bytes
+        )
+
+    def progress(self, now: Optional[float] = None) -> SearchProgress:
+        generated, expanded, open_size, visited_size, bound, nodes = self.last
+        elapsed = (now or time.perf_counter()) - self.start_time
+        return SearchProgress(
+            algorithm=self.algorithm,
+            elapsed=elapsed,
+            generated=generated,
+            expanded=expanded,
+            generated_per_second=generated / elapsed if elapsed else 0.0,
+            expanded_per_second=expanded / elapsed if elapsed else 0.0,
+            open=open_size,
+            visited=visited_size,
+            nodes=nodes,
+            bound=bound,
+            memory=self.memory(),
+            phases=dict(self.phases),
+        )
+
+
+class _NullMonitor(SearchMonitor):
+    # used when nobody is listening, so searches don't need to check
+
+    def __init__(self) -> None:
+        self.limited = False
+        self.check_interval = CHECK_INTERVAL
+        self.stop_reason = None
+
+    def track_visited(self, visited: Any) -> None:
+        pass
+
+    def set_entry_bytes(self, state: int, visited: int) -> None:
+        pass
+
+    def wrap(self, phase: str, fn: Optional[Callable]) -> Optional[Callable]:
+        return fn
+
+    def update(self, *args, **kwargs) -> None:
+        return None
+
+
+NULL_MONITOR = _NullMonitor()
+
+
+def observed(search_fn: Callable) -> Callable:
+    r"""
+    Decorates a search function to accept an ``observer`` (a :class:`SearchObserver`
+    or a progress callback), ``progress_interval`` (seconds, default ``1.0``) and
+    the ``time_limit``, ``node_limit`` and ``memory_limit`` budgets (see
+    :class:`SearchMonitor`). The search receives its :class:`SearchMonitor` as
+    the ``monitor`` argument. Searches that yield results (anytime searches)
+    finish with the last result they yield.
+    """
+
+    def get_monitor(kwargs: dict) -> Optional[SearchMonitor]:
+        observer = kwargs.pop("observer", None)
+        limits = {
+            limit: kwargs.pop(limit)
+            for limit in ("time_limit", "node_limit", "memory_limit")
+            if kwargs.get(limit) is not None
+        }
+        if observer is None and not limits:
+            return None
+        if observer is None:
+            observer = SearchObserver()
+        elif not isinstance(observer, SearchObserver):
+            observer = _CallbackObserver(observer)
+        return SearchMonitor(
+            search_fn.__name__, observer, kwargs.pop("progress_interval", 1.0), **limits
+        )
+
+    if inspect.isgeneratorfunction(search_fn):
+        @functools.wraps(search_fn)
+        def generator_wrapper(board: Board, **kwargs):
+            monitor = get_monitor(kwargs)
+            if monitor is None:
+                yield from search_fn(board, **kwargs)
+                return
+            monitor.start(board)
+            result = None
+            for result in search_fn(board, monitor=monitor, **kwargs):
+                yield result
+            if result is not None:
+                monitor.finish(result)
+
+        return generator_wrapper
+
+    @functools.wraps(search_fn)
+    def wrapper(board: Board, **kwargs):
+        monitor = get_monitor(kwargs)
+        if monitor is None:
+            return search_fn(board, **kwargs)
+        monitor.start(board)
+        result = search_fn(board, monitor=monitor, **kwargs)
+        monitor.finish(result)
+        return result
+
+    return wrapper
@@ -0,0 +1,129 @@
+import heapq
+import numbers
+from typing import Iterator
+
+from board import PackedBoard
+from states import State
+
+
+class OpenList:
+    """
+    A binary-heap open list that keeps the best depth (i.e. `g`) of every board
+    pushed, so duplicates are dropped at push time instead of being expanded.
+    A shorter path to a queued board replaces it (the old entry is skipped when
+    it reaches the top), and :func:`len` and iteration only count live states.
+
+    Args:
+        detect_dupes: Track boards and drop duplicates. If ``False``, every
+            state is kept, like a plain ``heapq`` list.
+    """
+
+    def __init__(self, detect_dupes: bool = True) -> None:
+        self.detect_dupes = detect_dupes
+        # the depth of each queued board, or ``~depth`` once it has been popped
+        self.depths: dict[PackedBoard, int] = {}
+        self.size = 0
+        self.heap: list[State] = []
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def __iter__(self) -> Iterator[State]:
+        return (state for state in self._entries() if self._live(state))
+
+    def push(self, state: State) -> bool:
+        r"""
+        Adds a state, unless its board was already pushed with a depth at most
+        as large.
+
+        Returns:
+            Whether the state was added.
+        """
+        if self.detect_dupes:
+            known = self.depths.get(state.board, None)
+            if known is not None:
+                if state.depth >= (known if known >= 0 else ~known):
+                    return False
+                if known < 0:
+                    self.size += 1
+            else:
+                self.size += 1
+            self.depths[state.board] = state.depth
+        else:
+            self.size += 1
+        self._push(state)
+        return True
+
+    def pop(self) -> State:
+        r"""
+        Removes and returns the live state with the lowest ``f``.
+        """
+        while True:
+            state = self._pop()
+            if not self.detect_dupes:
+                break
+            if self.depths[state.board] == state.depth:
+                self.depths[state.board] = ~state.depth
+                break
+        self.size -= 1
+        return state
+
+    def _live(self, state: State) -> bool:
+        return not self.detect_dupes or self.depths[state.board] == state.depth
+
+    def _entries(self) -> Iterator[State]:
+        return iter(self.heap)
+
+    def _push(self, state: State) -> None:
+        heapq.heappush(self.heap, state)
+
+    def _pop(self) -> State:
+        return heapq.heappop(self.heap)
+
+
+class BucketQueue(OpenList):
+    """
+    An :class:`OpenList` for integer ``f`` values, with a list (bucket) of
+    states per ``f``. Pushes are O(1) and pops only scan forward to the next
+    non-empty bucket. States with the same ``f`` are popped last in, first out,
+    which favours the deeper states of the latest expansion.
+    """
+
+    def __init__(self, detect_dupes: bool = True) -> None:
+        super().__init__(detect_dupes)
+        self.buckets: list[list[State]] = []
+        self.lowest = 0
+
+    def _entries(self) -> Iterator[State]:
+        return (state for bucket in self.buckets for state in bucket)
+
+    def _push(self, state: State) -> None:
+        f = int(state.f)
+        if f >= len(self.buckets):
+            self.buckets.extend([] for _ in range(f + 1 - len(self.buckets)))
+        self.buckets[f].append(state)
+        if f < self.lowest:
+            self.lowest = f
+
+    def _pop(self) -> State:
+        while not self.buckets[self.lowest]:
+            self.lowest += 1
+        return self.buckets[self.lowest].pop()
+
+
+def new_open_list(state: State, weight: float = 1, detect_dupes: bool = True) -> OpenList:
+    r"""
+    Returns a :class:`BucketQueue` if ``f`` is always an integer (an integer
+    heuristic value with an integer weight), otherwise a heap :class:`OpenList`.
+
+    Args:
+        state: The initial state, with its ``h`` set.
+        weight: The multiplier on ``h`` in ``f``.
+        detect_dupes: Drop duplicate states when they are pushed.
+    """
+    if isinstance(state.h, numbers.Integral) and isinstance(weight, numbers.Integral):
+        return BucketQueue(detect_dupes)
+    return OpenList(detect_dupes)
@@ -0,0 +1,172 @@
+import functools
+from typing import Optional
+
+from board import BLANK, Board, Layout, get_layout, pack_board
+
+# the number of moves replaced at once; the bounded search grows about 2x per move
+WINDOW = 12
+
+
+@functools.cache
+def get_distance_table(layout: Layout) -> tuple[tuple[int, ...], ...]:
+    r"""
+    The Manhattan distance between every pair of cells.
+    """
+    return tuple(
+        tuple(abs(y0 - y1) + abs(x0 - x1) for y1, x1 in layout.coords)
+        for y0, x0 in layout.coords
+    )
+
+
+def remove_loops(board: Board, moves: list[int]) -> list[int]:
+    r"""
+    Cuts every part of a path that returns to a board it already passed through,
+    which includes the pairs of moves that undo each other.
+
+    Args:
+        board: The board the path starts from.
+        moves: The flat blank positions of the moves.
+
+    Returns:
+        The flat blank positions of the shortened path.
+    """
+    layout = get_layout(*board.shape)
+    entries = [{move: factor for move, _, factor in cell_moves} for cell_moves in layout.moves]
+    packed = pack_board(board)
+    blank = board.ravel().tolist().index(BLANK)
+    # the boards along the path, and where each one first appears on it
+    boards = [packed]
+    seen = {packed: 0}
+    path = []
+    for move in moves:
+        tile = (packed >> (move * layout.bits)) & layout.mask
+        packed += tile * entries[blank][move]
+        blank = move
+        i = seen.get(packed, None)
+        if i is not None:
+            for looped in boards[i + 1:]:
+                del seen[looped]
+            del boards[i + 1:]
+            del path[i:]
+            continue
+        seen[packed] = len(boards)
+        boards.append(packed)
+        path.append(move)
+    return path
+
+
+def shortest_segment(
+        tiles: list[int], blank: int, target: list[int], limit: int, layout: Layout
+) -> Optional[list[int]]:
+    r"""
+    Runs an IDA* search for the shortest path between two boards, guided by the
+    Manhattan distance of the tiles to their cells on ``target``.
+
+    Args:
+        tiles: The flat tiles of the first board.
+        blank: The flat blank position on the first board.
+        target: The flat tiles of the second board.
+        limit: The most moves the path may take.
+        layout: The layout of the boards.
+
+    Returns:
+        The flat blank positions of the path, or ``None`` if it takes more than
+        ``limit`` moves.
+    """
+    distances = get_distance_table(layout)
+    goal = [0] * len(target)
+    for cell, tile in enumerate(target):
+        goal[tile] = cell
+    tiles = list(tiles)
+    h = sum(distances[cell][goal[tile]] for cell, tile in enumerate(tiles) if tile != BLANK)
+    path: list[int] = []
+
+    def dfs(blank: int, previous: int, g: int, h: int, bound: int) -> bool:
+        if not h:
+            return True
+        for move, _, _ in layout.moves[blank]:
+            if move == previous:
+                continue
+            tile = tiles[move]
+            next_h = h - distances[move][goal[tile]] + distances[blank][goal[tile]]
+            if g + 1 + next_h > bound:
+                continue
+            tiles[blank], tiles[move] = tile, BLANK
+            path.append(move)
+            if dfs(move, blank, g + 1, next_h, bound):
+                return True
+            path.pop()
+            tiles[move], tiles[blank] = tile, BLANK
+        return False
+
+    # every path between two boards has the same parity, so bounds go up by 2
+    for bound in range(h, limit + 1, 2):
+        if dfs(blank, -1, 0, h, bound):
+            return path
+    return None
+
+
+def optimize_moves(board: Board, moves: list[int], window: int = WINDOW) -> list[int]:
+    r"""
+    Shortens a path by sliding a window of ``window`` moves along it and
+    replacing each segment with the shortest path between its ends, until no
+    segment can be shortened. Loops are cut first (see :func:`remove_loops`).
+
+    The result is not optimal, since detours longer than the window are kept,
+    but it never has more moves than ``moves``.
+
+    Args:
+        board: The board the path starts from.
+        moves: The flat blank positions of the moves.
+        window: The number of moves searched at once.
+
+    Returns:
+        The flat blank positions of the shortened path.
+    """
+    layout = get_layout(*board.shape)
+    distances = get_distance_table(layout)
+    start = board.ravel().tolist()
+    moves = remove_loops(board, moves)
+    improved = True
+    while improved:
+        improved = False
+        tiles = list(start)
+        blank = tiles.index(BLANK)
+        i = 0
+        while i < len(moves):
+            segment = moves[i:i + window]
+            target, target_blank = list(tiles), blank
+            # where each tile moved by the segment starts and ends
+            starts, ends = {}, {}
+            for move in segment:
+                tile = target[move]
+                starts.setdefault(tile, move)
+                ends[tile] = target_blank
+                target[target_blank], target[move] = tile, BLANK
+                target_blank = move
+            # segments as long as the Manhattan distance between their ends are optimal
+            h = sum(distances[starts[tile]][ends[tile]] for tile in starts)
+            shorter = None
+            if h < len(segment):
+                shorter = shortest_segment(tiles, blank, target, len(segment) - 2, layout)
+            if shorter is not None:
+                moves[i:i + len(segment)] = shorter
+                improved = True
+                continue
+            tiles[blank], tiles[moves[i]] = tiles[moves[i]], BLANK
+            blank = moves[i]
+            i += 1
+    return moves
+
+
+def optimize_solution(
+        board: Board, solution: list[tuple[int, int]], window: int = WINDOW
+) -> list[tuple[int, int]]:
+    r"""
+    :func:`optimize_moves` for the (y, x)-coord solutions of a
+    :class:`states.SearchResult`.
+    """
+    layout = get_layout(*board.shape)
+    _, w = board.shape
+    moves = optimize_moves(board, [y * w + x for y, x in solution], window)
+    return [layout.coords[move] for move in moves]
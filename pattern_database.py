@@ -0,0 +1,258 @@
+import argparse
+import logging
+import os
+import tempfile
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from board import Board, get_goal_yx, get_layout
+from ranking import count_arrangements, rank_arrangement, rank_arrangements
+
+log = logging.getLogger(__name__)
+
+UNSEEN = 255
+DATABASE_DIR = os.environ.get(
+    "PUZZLE_PDB_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "databases"),
+)
+
+# disjoint tile groups used by default, keyed by board shape
+DEFAULT_PARTITIONS: dict[tuple[int, int], tuple[tuple[int, ...], ...]] = {
+    (3, 3): ((1, 2, 3, 4), (5, 6, 7, 8)),
+    (4, 4): ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+}
+
+# (tiles, table) pairs, keyed by board shape
+pattern_databases: dict[tuple[int, int], list[tuple[tuple[int, ...], npt.NDArray]]] = {}
+
+
+def default_partition(h: int, w: int, max_entries: int = 1 << 26) -> tuple[tuple[int, ...], ...]:
+    r"""
+    Splits the tiles of an ``h`` x ``w`` board into disjoint groups. Known shapes
+    use :data:`DEFAULT_PARTITIONS`, other shapes use consecutive groups of the
+    largest size whose search space (``arrangements * cells``) fits ``max_entries``.
+    """
+    if (h, w) in DEFAULT_PARTITIONS:
+        return DEFAULT_PARTITIONS[(h, w)]
+    n = h * w
+    k = 1
+    while k < n - 1 and count_arrangements(n, k + 1) * n <= max_entries:
+        k += 1
+    tiles = list(range(1, n))
+    return tuple(tuple(tiles[i:i + k]) for i in range(0, len(tiles), k))
+
+
+def generate_pattern_database(h: int, w: int, tiles: Sequence[int]) -> npt.NDArray[np.uint8]:
+    r"""
+    Builds an additive pattern database with a retrograde breadth-first search
+    from the goal. Only moves of the pattern tiles are counted, so databases for
+    disjoint tile groups can be summed and the result stays admissible.
+
+    Args:
+        h: The board height.
+        w: The board width.
+        tiles: The tiles of the pattern.
+
+    Returns:
+        A byte array mapping the :func:`ranking.rank_arrangement` of the
+        pattern tiles' positions to the number of pattern moves needed.
+    """
+    n, k = h * w, len(tiles)
+    size = count_arrangements(n, k)
+    layout = get_layout(h, w)
+    neighbors = np.full((n, 4), -1, dtype=np.int64)
+    for blank, moves in enumerate(layout.moves):
+        for d, (move, _, _) in enumerate(moves):
+            neighbors[blank, d] = move
+
+    # states are the pattern tile positions plus the blank position
+    dist = np.full(size * n, UNSEEN, dtype=np.uint8)
+    goal = [y * w + x for y, x in (get_goal_yx(h, w, tile) for tile in tiles)]
+    pos = np.array([goal], dtype=np.uint8)
+    blank = np.array([n - 1], dtype=np.int64)
+    dist[rank_arrangements(pos, n) * n + blank] = 0
+
+    cost = 0
+    while len(blank):
+        # blank moves that don't touch a pattern tile are free
+        layer_pos, layer_blank = [pos], [blank]
+        while len(blank):
+            pos, blank, _, _ = _expand(pos, blank, neighbors)
+            pos, blank = _record(pos, blank, dist, n, cost)
+            layer_pos.append(pos)
+            layer_blank.append(blank)
+        pos, blank = np.concatenate(layer_pos), np.concatenate(layer_blank)
+        log.debug(f"cost {cost}: {len(blank)} states")
+
+        # moving a pattern tile costs one
+        _, _, pos, blank = _expand(pos, blank, neighbors)
+        cost += 1
+        pos, blank = _record(pos, blank, dist, n, cost)
+
+    return dist.reshape(size, n).min(axis=1)
+
+
+def _expand(
+        pos: npt.NDArray, blank: npt.NDArray, neighbors: npt.NDArray
+) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray, npt.NDArray]:
+    # returns the successors that move a non-pattern tile, then those that move a pattern tile
+    free_pos, free_blank, tile_pos, tile_blank = [], [], [], []
+    for d in range(neighbors.shape[1]):
+        move = neighbors[blank, d]
+        valid = move >= 0
+        hit = pos == move[:, None]
+        moves_tile = hit.any(axis=1)
+
+        free = valid & ~moves_tile
+        free_pos.append(pos[free])
+        free_blank.append(move[free])
+
+        rows = np.flatnonzero(valid & moves_tile)
+        next_pos = pos[rows]
+        next_pos[np.arange(len(rows)), hit[rows].argmax(axis=1)] = blank[rows]
+        tile_pos.append(next_pos)
+        tile_blank.append(move[rows])
+    return (
+        np.concatenate(free_pos),
+        np.concatenate(free_blank),
+        np.concatenate(tile_pos),
+        np.concatenate(tile_blank),
+    )
+
+
+def _record(
+        pos: npt.NDArray, blank: npt.NDArray, dist: npt.NDArray, n: int, cost: int
+) -> tuple[npt.NDArray, npt.NDArray]:
+    # keeps (and labels) the states that were never reached before
+    index = rank_arrangements(pos, n) * n + blank
+    unseen = np.flatnonzero(dist[index] == UNSEEN)
+    index, first = np.unique(index[unseen], return_index=True)
+    dist[index] = cost
+    rows = unseen[first]
+    return pos[rows], blank[rows]
+
+
+def get_database_path(h: int, w: int, tiles: Sequence[int], directory: Optional[str] = None) -> str:
+    name = f"pdb_{h}x{w}_{'-'.join(str(tile) for tile in tiles)}.npy"
+    return os.path.join(directory or DATABASE_DIR, name)
+
+
+def load_pattern_database(
+        h: int, w: int, tiles: Sequence[int], directory: Optional[str] = None
+) -> npt.NDArray[np.uint8]:
+    r"""
+    Memory-maps a pattern database from disk, generating and saving it first if
+    needed. Since the file is mapped read-only, every process using it shares
+    a single copy through the OS page cache.
+
+    Args:
+        h: The board height.
+        w: The board width.
+        tiles: The tiles of the pattern.
+        directory: Where databases are stored. Defaults to :data:`DATABASE_DIR`.
+
+    Returns:
+        The (memory-mapped) database.
+    """
+    path = get_database_path(h, w, tiles, directory)
+    if not os.path.exists(path):
+        log.info(f"Generating pattern database {path}")
+        save_database(path, generate_pattern_database(h, w, tiles))
+    return np.load(path, mmap_mode="r")
+
+
+def save_database(path: str, table: npt.NDArray) -> None:
+    r"""
+    Saves a table as ``.npy``. It is written to a temporary file first, so
+    processes loading it concurrently never see a partial table.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npy")
+    with os.fdopen(fd, "wb") as file:
+        np.save(file, table)
+    os.replace(tmp_path, path)
+
+
+def get_pattern_databases(
+        h: int, w: int
+) -> list[tuple[tuple[int, ...], npt.NDArray[np.uint8]]]:
+    r"""
+    Returns the ``(tiles, database)`` pairs for the default partition of a board
+    shape, loading them once per process.
+    """
+    databases = pattern_databases.get((h, w), None)
+    if databases is None:
+        databases = [
+            (tiles, load_pattern_database(h, w, tiles))
+            for tiles in default_partition(h, w)
+        ]
+        pattern_databases[(h, w)] = databases
+    return databases
+
+
+def pattern_database_distance(board: Board) -> int:
+    r"""
+    Sums the additive pattern databases of the board's default partition.
+    """
+    h, w = board.shape
+    n = h * w
+    where = [0] * n
+    for i, tile in enumerate(board.flat):
+        where[tile] = i
+    dist = 0
+    for tiles, database in get_pattern_databases(h, w):
+        dist += int(database[rank_arrangement([where[tile] for tile in tiles], n)])
+    return dist
+
+
+def pattern_database_delta(h: int, w: int) -> Callable[[int, int, int, int], int]:
+    r"""
+    Incremental form of :func:`pattern_database_distance`: only the database of
+    the group containing the moved tile is looked up again. The children of a
+    state are evaluated one after the other, so the positions of the tiles and
+    the database values of the last board are kept for its next children.
+    """
+    layout = get_layout(h, w)
+    n = h * w
+    groups = {}
+    for tiles, database in get_pattern_databases(h, w):
+        for i, tile in enumerate(tiles):
+            groups[tile] = (tiles, i, database)
+    # the last board, where its tiles are and its value in each database looked up
+    last: list = [-1, [], {}]
+
+    def delta(board: int, tile: int, src: int, dst: int) -> int:
+        group = groups.get(tile, None)
+        if group is None:
+            return 0
+        tiles, i, database = group
+        if board != last[0]:
+            where = [0] * n
+            for cell in range(n):
+                where[(board >> (cell * layout.bits)) & layout.mask] = cell
+            last[:] = board, where, {}
+        _, where, values = last
+        positions = [where[t] for t in tiles]
+        before = values.get(tiles, None)
+        if before is None:
+            before = values[tiles] = int(database[rank_arrangement(positions, n)])
+        positions[i] = dst
+        return int(database[rank_arrangement(positions, n)]) - before
+
+    return delta
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-build the default pattern databases.")
+    parser.add_argument("h", type=int)
+    parser.add_argument("w", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    for tiles, database in get_pattern_databases(args.h, args.w):
+        log.info(f"tiles {tiles}: {len(database)} entries, max {database.max()}")
+
+
+if __name__ == "__main__":
+    main()
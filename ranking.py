@@ -0,0 +1,166 @@
+import math
+from typing import Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+
+def count_arrangements(n: int, k: int) -> int:
+    r"""
+    The number of ways to place ``k`` distinct tiles on ``n`` cells.
+    """
+    return math.perm(n, k)
+
+
+def rank_arrangement(positions: Sequence[int], n: int) -> int:
+    r"""
+    Maps the positions of ``k`` distinct tiles on ``n`` cells to a dense index in
+    ``range(count_arrangements(n, k))``. With ``k == n`` this is the Lehmer rank
+    of a permutation.
+
+    Args:
+        positions: The cell occupied by each tile.
+        n: The number of cells.
+
+    Returns:
+        The rank of the arrangement.
+    """
+    rank = 0
+    for i, p in enumerate(positions):
+        smaller = 0
+        for j in range(i):
+            if positions[j] < p:
+                smaller += 1
+        rank = rank * (n - i) + p - smaller
+    return rank
+
+
+def rank_packed_board(board: int, n: int, bits: int) -> int:
+    r"""
+    The :func:`rank_arrangement` of a packed board's tiles (in cell order), in
+    O(n): the tiles already seen are kept as a bitmask, so counting the smaller
+    ones is a popcount.
+
+    Args:
+        board: The packed board (see :func:`board.pack_board`).
+        n: The number of cells.
+        bits: The number of bits per tile.
+
+    Returns:
+        The Lehmer rank of the board.
+    """
+    mask = (1 << bits) - 1
+    rank, seen = 0, 0
+    for i in range(n):
+        tile = (board >> (i * bits)) & mask
+        rank = rank * (n - i) + tile - (seen & ((1 << tile) - 1)).bit_count()
+        seen |= 1 << tile
+    return rank
+
+
+def count_parity_ranks(n: int) -> int:
+    r"""
+    The number of ranks of :func:`rank_packed_board_parity`, i.e. half of the
+    boards with ``n`` cells.
+    """
+    return n * max(1, math.factorial(n - 1) // 2)
+
+
+def rank_packed_board_parity(board: int, n: int, bits: int) -> int:
+    r"""
+    Ranks a packed board among the boards whose tiles (in cell order, without
+    the blank) have the same inversion parity. The rank is the blank's cell
+    followed by the Lehmer rank of the tiles without its last digit: that digit
+    is the only one that differs between a board and the board with its last two
+    tiles swapped, which has the other parity.
+
+    Boards that can reach each other by moves all have different ranks, in
+    ``range(count_parity_ranks(n))``.
+
+    Args:
+        board: The packed board (see :func:`board.pack_board`).
+        n: The number of cells.
+        bits: The number of bits per tile.
+
+    Returns:
+        The rank of the board.
+    """
+    mask = (1 << bits) - 1
+    rank, seen, blank, i = 0, 0, 0, 0
+    for cell in range(n):
+        tile = (board >> (cell * bits)) & mask
+        if not tile:
+            blank = cell
+            continue
+        rank = rank * (n - 1 - i) + tile - 1 - (seen & ((1 << tile) - 1)).bit_count()
+        seen |= 1 << tile
+        i += 1
+    return blank * max(1, math.factorial(n - 1) // 2) + (rank >> 1)
+
+
+def unrank_board_parity(rank: int, n: int, parities: Sequence[int]) -> list[int]:
+    r"""
+    Inverse of :func:`rank_packed_board_parity`.
+
+    Args:
+        rank: The rank of the board.
+        n: The number of cells.
+        parities: The inversion parity of the tiles for each cell of the blank.
+
+    Returns:
+        The tiles of the board, in cell order.
+    """
+    blank, rank = divmod(rank, max(1, math.factorial(n - 1) // 2))
+    rank <<= 1
+    tiles = [tile + 1 for tile in unrank_arrangement(rank, n - 1, n - 1)]
+    # the digits of a Lehmer rank add up to its inversions
+    inversions = 0
+    for radix in range(2, n):
+        rank, digit = divmod(rank, radix)
+        inversions += digit
+    if inversions % 2 != parities[blank]:
+        tiles[-2], tiles[-1] = tiles[-1], tiles[-2]
+    return tiles[:blank] + [0] + tiles[blank:]
+
+
+def rank_arrangements(positions: npt.NDArray, n: int) -> npt.NDArray[np.int64]:
+    r"""
+    Vectorized :func:`rank_arrangement` over the rows of a 2-D array.
+
+    Args:
+        positions: An array of shape ``(count, k)`` of tile positions.
+        n: The number of cells.
+
+    Returns:
+        An array with the rank of each row.
+    """
+    positions = positions.astype(np.int64, copy=False)
+    count, k = positions.shape
+    rank = np.zeros(count, dtype=np.int64)
+    for i in range(k):
+        digit = positions[:, i].copy()
+        for j in range(i):
+            digit -= positions[:, j] < positions[:, i]
+        rank = rank * (n - i) + digit
+    return rank
+
+
+def unrank_arrangement(rank: int, n: int, k: int) -> list[int]:
+    r"""
+    Inverse of :func:`rank_arrangement`.
+
+    Args:
+        rank: The rank of the arrangement.
+        n: The number of cells.
+        k: The number of tiles.
+
+    Returns:
+        The cell occupied by each tile.
+    """
+    digits = []
+    for i in reversed(range(k)):
+        rank, digit = divmod(rank, n - i)
+        digits.append(digit)
+    digits.reverse()
+    free = list(range(n))
+    return [free.pop(digit) for digit in digits]
@@ -0,0 +1,70 @@
+import argparse
+import dataclasses
+
+from board import get_layout
+from frontier import MAX_FRONTIER_CELLS, fits_uint64, get_key_dtype
+from pattern_database import default_partition
+from ranking import count_parity_ranks
+from solution_table import MAX_TABLE_CELLS
+from visited import MAX_BITSET_BITS
+
+
+@dataclasses.dataclass
+class ScalingProfile:
+    """
+    How boards of a shape are encoded, and which tables can be used for them.
+
+    Args:
+        shape: The board shape.
+        bits: The bits used per tile in packed boards.
+        packed_bits: The bits of a packed board. Searches keep packed boards as
+            Python ints, which take one machine word up to 60 bits and grow by
+            a 30-bit digit after that, so they work for any size.
+        key: The key of vectorized and external-memory searches (see
+            :func:`frontier.get_key_dtype`), ``"uint64"``, ``"bytes"`` or
+            ``"none"`` above 256 cells.
+        key_bytes: The bytes per key.
+        bitset: Whether ``visited="bitset"`` is available.
+        solution_table: Whether the solution table (and ``"table"`` search) is available.
+        pattern_groups: The tile groups of the default pattern databases.
+    """
+    shape: tuple[int, int]
+    bits: int
+    packed_bits: int
+    key: str
+    key_bytes: int
+    bitset: bool
+    solution_table: bool
+    pattern_groups: tuple[tuple[int, ...], ...]
+
+
+def get_scaling_profile(h: int, w: int) -> ScalingProfile:
+    layout = get_layout(h, w)
+    n = h * w
+    if n > MAX_FRONTIER_CELLS:
+        key, key_bytes = "none", 0
+    else:
+        key, key_bytes = "uint64" if fits_uint64(layout) else "bytes", get_key_dtype(layout).itemsize
+    return ScalingProfile(
+        (h, w),
+        layout.bits,
+        n * layout.bits,
+        key,
+        key_bytes,
+        count_parity_ranks(n) <= MAX_BITSET_BITS,
+        n <= MAX_TABLE_CELLS,
+        default_partition(h, w),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show how boards of a shape are encoded.")
+    parser.add_argument("h", type=int)
+    parser.add_argument("w", type=int)
+    args = parser.parse_args()
+    for field, value in dataclasses.asdict(get_scaling_profile(args.h, args.w)).items():
+        print(f"{field}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import collections
+import dataclasses
+import functools
+import sqlite3
+from typing import Optional
+
+import numpy as np
+
+from board import BLANK, Board, Layout, PackedBoard, get_layout, pack_board
+
+# rough per-entry cost (bytes) of a cached solution, besides its moves
+ENTRY_BYTES = 200
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """
+    Args:
+        hits: Lookups answered from memory or from the database.
+        misses: Lookups that found nothing.
+        evictions: Entries dropped from memory to respect the limits.
+        entries: The number of solutions in memory.
+        nbytes: A rough estimate of the bytes held in memory.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@functools.cache
+def get_transpose_tables(layout: Layout) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    r"""
+    The tables that transpose a square board: the cell each cell moves to, and
+    the tile each tile is renamed to so that the goal stays the goal.
+    """
+    n = layout.h * layout.w
+    cells = tuple(x * layout.w + y for y, x in layout.coords)
+    # tile t sits on cell t - 1 of the goal, the blank on the last cell
+    tiles = (BLANK,) + tuple(cells[tile - 1] + 1 for tile in range(1, n))
+    return cells, tiles
+
+
+def transpose_board(packed: PackedBoard, layout: Layout) -> PackedBoard:
+    r"""
+    Mirrors a packed square board along its main diagonal. The solved board is
+    its own transpose, so the moves solving one board, transposed, solve the other.
+    """
+    cells, tiles = get_transpose_tables(layout)
+    transposed = 0
+    for cell in range(layout.h * layout.w):
+        tile = (packed >> (cell * layout.bits)) & layout.mask
+        transposed |= tiles[tile] << (cells[cell] * layout.bits)
+    return transposed
+
+
+def canonical_board(board: Board) -> tuple[PackedBoard, bool]:
+    r"""
+    Maps a board to the smallest packed board among its symmetric versions.
+
+    Only the transpose of square boards keeps the goal fixed: reflections and
+    rotations move the blank away from the bottom-right corner.
+
+    Returns:
+        The canonical packed board, and whether it is the transpose of ``board``.
+    """
+    h, w = board.shape
+    packed = pack_board(board)
+    if h != w:
+        return packed, False
+    transposed = transpose_board(packed, get_layout(h, w))
+    return (transposed, True) if transposed < packed else (packed, False)
+
+
+class SolutionCache:
+    """
+    A least-recently-used cache of solutions, keyed by the canonical board (see
+    :func:`canonical_board`) so that a board and its transpose share an entry.
+    Solutions are stored as the flat blank positions of their moves, one byte
+    each for boards of up to 256 cells and two bytes beyond.
+
+    Args:
+        max_entries: The number of solutions kept in memory.
+        max_bytes: A limit on the estimated bytes kept in memory. Default is ``None``.
+        path: An SQLite database that entries are also written to, and read from
+            when they are not in memory. Default is ``None`` (memory only).
+    """
+
+    def __init__(
+            self, max_entries: int = 100_000, max_bytes: Optional[int] = None, path: Optional[str] = None
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: collections.OrderedDict[tuple, bytes] = collections.OrderedDict()
+        self.nbytes = 0
+        self.hits, self.misses, self.evictions = 0, 0, 0
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS solutions (key TEXT PRIMARY KEY, moves BLOB NOT NULL)"
+            )
+            self.db.commit()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, board: Board, namespace: str = "") -> Optional[list[tuple[int, int]]]:
+        r"""
+        Looks up the solution of a board.
+
+        Args:
+            board: The board.
+            namespace: Separates solutions of different kinds (e.g. optimal and
+                suboptimal ones).
+
+        Returns:
+            The (y, x)-coord moves, or ``None`` on a miss.
+        """
+        key, transposed = self._key(board, namespace)
+        moves = self.entries.get(key, None)
+        if moves is not None:
+            self.entries.move_to_end(key)
+        elif self.db is not None:
+            row = self.db.execute("SELECT moves FROM solutions WHERE key = ?", (_db_key(key),)).fetchone()
+            if row is not None:
+                moves = bytes(row[0])
+                self._add(key, moves)
+        if moves is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _decode(moves, board.shape, transposed)
+
+    def put(self, board: Board, solution: list[tuple[int, int]], namespace: str = "") -> None:
+        r"""
+        Stores the solution of a board (and so of its transpose).
+        """
+        key, transposed = self._key(board, namespace)
+        moves = _encode(solution, board.shape, transposed)
+        self._add(key, moves)
+        if self.db is not None:
+            self.db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)", (_db_key(key), moves))
+            self.db.commit()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions, len(self.entries), self.nbytes)
+
+    def clear(self) -> None:
+        r"""
+        Empties the in-memory cache (the database is kept).
+        """
+        self.entries.clear()
+        self.nbytes = 0
+
+    def close(self) -> None:
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    def _key(self, board: Board, namespace: str) -> tuple[tuple, bool]:
+        packed, transposed = canonical_board(board)
+        return (namespace, board.shape, packed), transposed
+
+    def _add(self, key: tuple, moves: bytes) -> None:
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= ENTRY_BYTES + len(old)
+        self.entries[key] = moves
+        self.nbytes += ENTRY_BYTES + len(moves)
+        while self.entries and (
+                len(self.entries) > self.max_entries
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= ENTRY_BYTES + len(evicted)
+            self.evictions += 1
+
+
+def _db_key(key: tuple) -> str:
+    namespace, (h, w), packed = key
+    return f"{namespace}:{h}x{w}:{packed:x}"
+
+
+def _move_dtype(shape: tuple[int, int]) -> np.dtype:
+    # the narrowest little-endian type that holds every flat position, one byte
+    # per move up to 16x16 (so existing databases still read back)
+    h, w = shape
+    for dtype in ("u1", "<u2", "<u4"):
+        if h * w <= np.iinfo(dtype).max + 1:
+            return np.dtype(dtype)
+    raise ValueError(f"{h}x{w} boards are too large to cache")
+
+
+def _encode(solution: list[tuple[int, int]], shape: tuple[int, int], transposed: bool) -> bytes:
+    _, w = shape
+    if transposed:
+        moves = [x * w + y for y, x in solution]
+    else:
+        moves = [y * w + x for y, x in solution]
+    return np.array(moves, dtype=_move_dtype(shape)).tobytes()
+
+
+def _decode(moves: bytes, shape: tuple[int, int], transposed: bool) -> list[tuple[int, int]]:
+    _, w = shape
+    flat = np.frombuffer(moves, dtype=_move_dtype(shape)).tolist()
+    if transposed:
+        return [(move % w, move // w) for move in flat]
+    return [(move // w, move % w) for move in flat]
@@ -0,0 +1,134 @@
+import logging
+import math
+import os
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from board import BLANK, Board, get_layout
+from frontier import expand_frontier, unpack_boards
+from pattern_database import DATABASE_DIR, save_database
+from ranking import rank_arrangement, rank_arrangements
+
+log = logging.getLogger(__name__)
+
+# boards up to this size have a table of every state (9! bytes for 3x3)
+MAX_TABLE_CELLS = 9
+UNREACHABLE = 0xFF
+# each entry packs the distance to the goal in its low bits and the index of
+# the best move (in layout.moves order) in its top two bits
+MOVE_SHIFT = 6
+DISTANCE_MASK = (1 << MOVE_SHIFT) - 1
+
+solution_tables: dict[tuple[int, int], memoryview] = {}
+
+
+def generate_solution_table(h: int, w: int) -> npt.NDArray[np.uint8]:
+    r"""
+    Runs a breadth-first search backwards from the goal over every state of an
+    ``h`` x ``w`` board, recording each state's distance and first optimal move.
+    Each level is expanded at once with :func:`frontier.expand_frontier`.
+
+    Args:
+        h: The board height.
+        w: The board width.
+
+    Returns:
+        A byte array indexed by the :func:`ranking.rank_arrangement` of the board's
+        tiles (in row-major order). Unsolvable states are :data:`UNREACHABLE`.
+    """
+    n = h * w
+    if n > MAX_TABLE_CELLS:
+        raise ValueError(f"Solution tables are limited to {MAX_TABLE_CELLS} tiles.")
+    layout = get_layout(h, w)
+    # back[move, blank] is the index (in layout.moves[move]) of the move back to blank
+    back = np.zeros((n, n), dtype=np.uint8)
+    for blank, moves in enumerate(layout.moves):
+        for move, _, _ in moves:
+            back[move, blank] = [m for m, _, _ in layout.moves[move]].index(blank)
+
+    table = np.full(math.factorial(n), UNREACHABLE, dtype=np.uint8)
+    boards = np.array([layout.goal], dtype=np.uint64)
+    blanks = np.array([n - 1], dtype=np.int64)
+    table[rank_arrangements(unpack_boards(boards, layout), n)] = 0
+    dist = 0
+    while len(boards):
+        children, child_blanks, parents = expand_frontier(boards, blanks, layout)
+        ranks = rank_arrangements(unpack_boards(children, layout), n)
+        # keep (and label) the states that were never reached before
+        unseen = np.flatnonzero(table[ranks] == UNREACHABLE)
+        ranks, first = np.unique(ranks[unseen], return_index=True)
+        rows = unseen[first]
+        dist += 1
+        # from the new state, moving the blank back is the best move
+        moves = back[child_blanks[rows], blanks[parents[rows]]]
+        table[ranks] = (moves << MOVE_SHIFT) | dist
+        boards, blanks = children[rows], child_blanks[rows]
+    return table
+
+
+def get_table_path(h: int, w: int, directory: Optional[str] = None) -> str:
+    return os.path.join(directory or DATABASE_DIR, f"solutions_{h}x{w}.npy")
+
+
+def get_solution_table(h: int, w: int) -> memoryview:
+    r"""
+    Memory-maps the solution table of a board shape (generating and saving it
+    the first time), once per process.
+    """
+    table = solution_tables.get((h, w), None)
+    if table is None:
+        path = get_table_path(h, w)
+        if not os.path.exists(path):
+            log.info(f"Generating solution table {path}")
+            save_database(path, generate_solution_table(h, w))
+        table = memoryview(np.load(path, mmap_mode="r"))
+        solution_tables[(h, w)] = table
+    return table
+
+
+def table_distance(board: Board) -> int:
+    r"""
+    The exact optimal solution length, read from the solution table.
+    """
+    h, w = board.shape
+    rank = rank_arrangement(board.ravel().tolist(), h * w)
+    return get_solution_table(h, w)[rank] & DISTANCE_MASK
+
+
+def table_distances(boards: npt.NDArray) -> npt.NDArray[np.uint8]:
+    r"""
+    Batch :func:`table_distance` of an array of shape ``(k, h, w)``.
+    """
+    _, h, w = boards.shape
+    ranks = rank_arrangements(boards.reshape(len(boards), -1), h * w)
+    return np.asarray(get_solution_table(h, w))[ranks] & DISTANCE_MASK
+
+
+def lookup_solution(board: Board) -> tuple[list[int], int]:
+    r"""
+    Follows the best moves stored in the solution table from ``board`` to the goal.
+
+    Args:
+        board: The board.
+
+    Returns:
+        The flat blank positions of an optimal solution, and the number of table
+        entries read.
+    """
+    h, w = board.shape
+    n = h * w
+    layout = get_layout(h, w)
+    table = get_solution_table(h, w)
+    tiles = board.ravel().tolist()
+    blank = tiles.index(BLANK)
+    moves = []
+    entry = table[rank_arrangement(tiles, n)]
+    while entry & DISTANCE_MASK:
+        move = layout.moves[blank][entry >> MOVE_SHIFT][0]
+        tiles[blank], tiles[move] = tiles[move], BLANK
+        blank = move
+        moves.append(move)
+        entry = table[rank_arrangement(tiles, n)]
+    return moves, len(moves) + 1
@@ -1,32 +1,73 @@
-from typing import Collection, Optional
+from typing import Collection, Iterator, Optional
 
+import array
 import dataclasses
 
-from board import Board, FrozenBoard, solution_as_tiles
+from board import Board, FrozenBoard, PackedBoard, solution_as_tiles, unpack_board
 
 
-@dataclasses.dataclass(order=True)
+@dataclasses.dataclass(order=True, slots=True)
 class State:
     """
     Args:
-        board: The board state.
-        blank_pos: The (y, x)-coord of the blank tile.
-        history: A list of (y, x)-coords representing moves from the initial
-            state to the current board state.
+        board: The packed board state (see :func:`board.pack_board`).
+        blank_pos: The flat index of the blank tile.
+        node: The index of this state's entry in the search's :class:`NodeTable`.
+        depth: The number of moves made from the initial state.
+        h: The heuristic value of the board, for searches that use one.
         f: The `f` value of the state. This is the sum of the `g` and `h` values.
         g: For some search algorithms, this will hold the number of moves made to reach
             this state. Used to tie-break when `f` values are identical.
     """
 
-    board: Board = dataclasses.field(compare=False)
-    blank_pos: tuple[int, int] = dataclasses.field(compare=False)
-    history: list[tuple[int, int]] = dataclasses.field(
-        compare=False, default_factory=list
-    )
+    board: PackedBoard = dataclasses.field(compare=False)
+    blank_pos: int = dataclasses.field(compare=False)
+    node: int = dataclasses.field(compare=False, default=0)
+    depth: int = dataclasses.field(compare=False, default=0)
+    h: int | float = dataclasses.field(compare=False, default=0)
     f: int | float = 0
     g: int = 0  # stored separately for tie-breaking
 
 
+class NodeTable:
+    """
+    Parent/move back-pointers for every state generated during a search.
+
+    Each state only stores the index of its entry, so the moves leading to it
+    are rebuilt once (with :meth:`path`) instead of being copied into every child.
+    Entry ``0`` is the initial state.
+    """
+
+    def __init__(self) -> None:
+        self.parents = array.array("q", [-1])
+        self.moves = array.array("H", [0])
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def add(self, parent: int, move: int) -> int:
+        r"""
+        Records a child of ``parent`` reached by moving the blank to ``move``.
+
+        Returns:
+            The index of the new entry.
+        """
+        self.parents.append(parent)
+        self.moves.append(move)
+        return len(self.parents) - 1
+
+    def path(self, node: int) -> list[int]:
+        r"""
+        Returns the flat blank positions (i.e. moves) from the initial state to ``node``.
+        """
+        moves = []
+        while node > 0:
+            moves.append(self.moves[node])
+            node = self.parents[node]
+        moves.reverse()
+        return moves
+
+
 @dataclasses.dataclass
 class SearchResult:
     """
@@ -35,15 +76,27 @@ class SearchResult:
         generated: The number of states generated during search.
         expanded: The number of states evaluated during search.
         unvisited: The list of states that were never reached.
-        visited: The set of boards evaluated.
+        visited: The set of packed boards evaluated (see :func:`board.pack_board`
+            and :meth:`visited_boards`).
         solution: The list of moves from initial position to solution.
+        complete: ``False`` if the search was stopped by a budget.
+        stop_reason: The exhausted budget (``"time"``, ``"nodes"`` or ``"memory"``).
+        best: For incomplete searches, the packed board with the lowest ``h`` reached.
+        best_solution: The list of moves from initial position to ``best``.
+        suboptimality: For searches that prove one, a bound on the ratio of the
+            solution's length to the optimal length.
     """
     board: Board
     generated: int
     expanded: int
     unvisited: Collection[State]
-    visited: set[FrozenBoard]
+    visited: set[PackedBoard]
     solution: Optional[list[tuple[int, int]]]
+    complete: bool = True
+    stop_reason: Optional[str] = None
+    best: Optional[PackedBoard] = None
+    best_solution: Optional[list[tuple[int, int]]] = None
+    suboptimality: Optional[float] = None
 
     def __repr__(self) -> str:
         solution = (
@@ -58,6 +111,86 @@ class SearchResult:
             f"expanded={self.expanded}, "
             f"unvisited={len(self.unvisited)}, "
             f"visited={len(self.visited)}"
+            + ("" if self.complete else f", incomplete ({self.stop_reason})")
+            + ("" if self.suboptimality is None else f", suboptimality={self.suboptimality:.3f}")
+        )
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def visited_boards(self) -> Iterator[FrozenBoard]:
+        r"""
+        The visited boards as nested tuples, the form ``visited`` held before
+        boards were packed. Each one is unpacked on the fly, so iterate instead of
+        collecting them for large searches.
+        """
+        h, w = self.board.shape
+        for packed in self.visited:
+            yield tuple(tuple(row) for row in unpack_board(packed, h, w).tolist())
+
+    def summary(self) -> "SearchSummary":
+        return SearchSummary(
+            self.board,
+            self.generated,
+            self.expanded,
+            len(self.unvisited),
+            len(self.visited),
+            self.solution,
+            self.complete,
+            self.stop_reason,
+            self.best,
+            self.best_solution,
+            self.suboptimality,
+        )
+
+
+@dataclasses.dataclass
+class SearchSummary:
+    """
+    A :class:`SearchResult` without its frontier and visited states, which is
+    cheap to keep around and to send between processes.
+
+    Args:
+        board: The original input board.
+        generated: The number of states generated during search.
+        expanded: The number of states evaluated during search.
+        unvisited: The number of states that were never reached.
+        visited: The number of boards evaluated.
+        solution: The list of moves from initial position to solution.
+        complete: ``False`` if the search was stopped by a budget.
+        stop_reason: The exhausted budget (``"time"``, ``"nodes"`` or ``"memory"``).
+        best: For incomplete searches, the packed board with the lowest ``h`` reached.
+        best_solution: The list of moves from initial position to ``best``.
+        suboptimality: For searches that prove one, a bound on the ratio of the
+            solution's length to the optimal length.
+    """
+    board: Board
+    generated: int
+    expanded: int
+    unvisited: int
+    visited: int
+    solution: Optional[list[tuple[int, int]]]
+    complete: bool = True
+    stop_reason: Optional[str] = None
+    best: Optional[PackedBoard] = None
+    best_solution: Optional[list[tuple[int, int]]] = None
+    suboptimality: Optional[float] = None
+
+    def __repr__(self) -> str:
+        solution = (
+            solution_as_tiles(self.board, self.solution)
+            if self.solution
+            else "N/A"
+        )
+        return (
+            f"solution={solution}\n"
+            f"solution_len={len(self.solution) if self.solution else 'N/A'}, "
+            f"generated={self.generated}, "
+            f"expanded={self.expanded}, "
+            f"unvisited={self.unvisited}, "
+            f"visited={self.visited}"
+            + ("" if self.complete else f", incomplete ({self.stop_reason})")
+            + ("" if self.suboptimality is None else f", suboptimality={self.suboptimality:.3f}")
         )
 
     def __str__(self) -> str:
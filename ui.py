@@ -44,7 +44,7 @@ def update_config_view():
     algo_dropdown.grid(row=0, column=1)
 
     # if algo is astar or greedy
-    if algo == Algorithm.A_ESTRELA or algo == Algorithm.BUSCA_GULOSA:
+    if algo in HEURISTIC_ALGORITHMS:
         # heuristic dropdown
 
         heuristic_dropdown = tk.OptionMenu(header, selected_heuristic, *HEURISTICS_MAP.keys(),
@@ -136,6 +136,9 @@ HEURISTICS_MAP = {
     "MANHATTAN": manhattan_distance,
     "EUCLIDEAN": euclidean_distance,
     "HAMMING": hamming_distance,
+    "PATTERN_DATABASE": pattern_database_distance,
+    "LINEAR_CONFLICT": linear_conflict_distance,
+    "WALKING_DISTANCE": walking_distance,
 }
 
 
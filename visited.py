@@ -0,0 +1,111 @@
+from typing import Iterator, Optional
+
+from board import BLANK, Layout, PackedBoard, get_layout, permutation_parity
+from ranking import count_parity_ranks, rank_packed_board_parity, unrank_board_parity
+
+# the largest bitset allowed (1 GiB), enough for every reachable 3x4 board
+MAX_BITSET_BITS = 1 << 33
+
+
+class BitsetVisited:
+    """
+    A set of packed boards that uses one bit per board: each board is mapped
+    to its rank among the boards of the same parity (see
+    :func:`ranking.rank_packed_board_parity`), which indexes a bit array with a
+    bit for every board reachable from a given one. The boards added must all
+    be reachable from each other, as in one search. Only practical up to 12
+    tiles (12! / 2 bits is about 30 MB).
+
+    Args:
+        h: The board height.
+        w: The board width.
+    """
+
+    def __init__(self, h: int, w: int) -> None:
+        size = count_parity_ranks(h * w)
+        if size > MAX_BITSET_BITS:
+            raise ValueError(
+                f"A bitset of {h}x{w} boards needs {size} bits, the limit is {MAX_BITSET_BITS}."
+            )
+        self.layout = get_layout(h, w)
+        self.n = h * w
+        self.bits = bytearray((size + 7) >> 3)
+        self.count = 0
+        # the inversion parity of the tiles of the boards added, for each cell of the blank
+        self.parities: Optional[tuple[int, ...]] = None
+        # visit() tests then adds the same board, so remember the last rank
+        self._last = (-1, 0)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+    def _rank(self, board: PackedBoard) -> int:
+        last_board, rank = self._last
+        if board != last_board:
+            rank = rank_packed_board_parity(board, self.n, self.layout.bits)
+            self._last = (board, rank)
+        return rank
+
+    def __contains__(self, board: PackedBoard) -> bool:
+        rank = self._rank(board)
+        return bool(self.bits[rank >> 3] & (1 << (rank & 7)))
+
+    def add(self, board: PackedBoard) -> None:
+        rank = self._rank(board)
+        byte, bit = rank >> 3, 1 << (rank & 7)
+        if not self.bits[byte] & bit:
+            self.bits[byte] |= bit
+            self.count += 1
+        if self.parities is None:
+            self.parities = get_parities(board, self.layout)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[PackedBoard]:
+        for byte, value in enumerate(self.bits):
+            while value:
+                low = value & -value
+                value ^= low
+                rank = (byte << 3) | (low.bit_length() - 1)
+                tiles = unrank_board_parity(rank, self.n, self.parities)
+                yield sum(tile << (i * self.layout.bits) for i, tile in enumerate(tiles))
+
+
+def get_parities(board: PackedBoard, layout: Layout) -> tuple[int, ...]:
+    r"""
+    The inversion parity of the tiles (without the blank) of the boards
+    reachable from ``board``, for each cell of the blank (see
+    :func:`board.is_solvable`).
+    """
+    tiles = [(board >> (i * layout.bits)) & layout.mask for i in range(layout.h * layout.w)]
+    blank = tiles.index(BLANK)
+    parity = permutation_parity([tile for tile in tiles if tile != BLANK])
+    if layout.w % 2:
+        # moves keep the parity on boards of odd width
+        return (parity,) * (layout.h * layout.w)
+    # and flip it with the blank's row on boards of even width
+    rows = [cell // layout.w for cell in range(layout.h * layout.w)]
+    return tuple((parity + rows[blank] - row) % 2 for row in rows)
+
+
+def new_visited(kind: str, h: int, w: int) -> set[PackedBoard] | BitsetVisited:
+    r"""
+    Creates the visited set of a search.
+
+    Args:
+        kind: ``"set"`` for a Python set (fast, but ~70 bytes per board) or
+            ``"bitset"`` for a :class:`BitsetVisited` (one bit per reachable board,
+            but ranking each board makes it a few times slower).
+        h: The board height.
+        w: The board width.
+
+    Returns:
+        An empty visited set.
+    """
+    if kind == "set":
+        return set()
+    if kind == "bitset":
+        return BitsetVisited(h, w)
+    raise ValueError(f"Unknown visited set: {kind}")